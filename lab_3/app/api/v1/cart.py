@@ -4,6 +4,7 @@ from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
+import httpx
 
 from app.infrastructure.database import Database
 from app.application.cart.create_cart import CreateCartUseCase
@@ -54,13 +55,13 @@ class CheckoutResponse(BaseModel):
 async def get_db_session(request: Request) -> AsyncSession:
     """Get database session from app state"""
     db: Database = request.app.state.db
-    async for session in db.get_session():
+    async with db.session() as session:
         yield session
 
 
-def get_products_service_url(request: Request) -> str:
-    """Get products service URL from app state"""
-    return request.app.state.products_service_url
+def get_products_client(request: Request) -> httpx.AsyncClient:
+    """Get pooled products service HTTP client from app state"""
+    return request.app.state.products_client
 
 
 # === Command Endpoints (Write) ===
@@ -94,7 +95,7 @@ async def add_item_to_cart(
     cart_id: UUID,
     payload: AddItemRequest,
     session: AsyncSession = Depends(get_db_session),
-    products_service_url: str = Depends(get_products_service_url),
+    products_client: httpx.AsyncClient = Depends(get_products_client),
 ):
     """
     Add a product to the cart.
@@ -109,7 +110,7 @@ async def add_item_to_cart(
             quantity=payload.quantity,
         )
         
-        use_case = AddItemToCartUseCase(session, products_service_url)
+        use_case = AddItemToCartUseCase(session, products_client)
         await use_case.execute(command)
         
         return {"message": "Item added successfully"}
@@ -51,8 +51,8 @@ class CheckoutResponse(BaseModel):
 async def get_db_session(request: Request) -> AsyncSession: # type: ignore
     """Get database session from app state"""
     db: Database = request.app.state.db
-    async for session in db.get_session(): # type: ignore
-        yield session # type: ignore
+    async with db.session() as session:
+        yield session
 
 
 # === Command Endpoints (Write) ===
@@ -0,0 +1,67 @@
+import asyncio
+import logging
+import random
+from collections import defaultdict
+from typing import Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+# Learned backoff (ms) between optimistic locking retries, keyed by
+# (transaction name, prior aborts capped at 2): grows after an abort,
+# shrinks after a commit, so hot and cold use cases settle on their own delay
+INITIAL_MS = 10.0
+MIN_MS = 1.0
+MAX_MS = 1000.0
+ABORT_FACTOR = 1.2
+COMMIT_FACTOR = 1 / 1.1
+
+_BACKOFF_TABLE: defaultdict[tuple[str, int], float] = defaultdict(lambda: INITIAL_MS)
+
+
+def _key(name: str, attempt: int) -> tuple[str, int]:
+    return name, min(attempt, 2)
+
+
+def _record(name: str, attempt: int, committed: bool) -> None:
+    """Adjust the learned backoff after a commit or an abort"""
+    key = _key(name, attempt)
+    factor = COMMIT_FACTOR if committed else ABORT_FACTOR
+    _BACKOFF_TABLE[key] = min(MAX_MS, max(MIN_MS, _BACKOFF_TABLE[key] * factor))
+
+
+def backoff_delay(name: str, attempt: int) -> float:
+    """Random delay in seconds from [0, learned backoff) ms"""
+    return random.random() * _BACKOFF_TABLE[_key(name, attempt)] / 1000
+
+
+async def retry_with_backoff(
+    operation: Callable[[], Awaitable[T]],
+    max_retries: int,
+    retry_on: type[Exception],
+    name: str = "default",
+) -> T:
+    """
+    Run operation, retrying on retry_on with a learned, jittered backoff.
+
+    Concurrent writers that conflicted on the same aggregate version would
+    otherwise reload and collide again in lockstep. name identifies the
+    transaction type whose backoff table entries are used and updated.
+    Only retry_on is retried - any other error (e.g. ValueError for a missing
+    product) propagates on the first attempt with its original type.
+    Re-raises the last exception after max_retries attempts.
+    """
+    for attempt in range(max_retries):
+        try:
+            result = await operation()
+        except retry_on:
+            _record(name, attempt, committed=False)
+            if attempt == max_retries - 1:
+                raise
+            logger.debug("optimistic retry name=%s attempt=%d", name, attempt + 1)
+            await asyncio.sleep(backoff_delay(name, attempt))
+        else:
+            _record(name, attempt, committed=True)
+            return result
+    raise RuntimeError("max_retries must be positive")
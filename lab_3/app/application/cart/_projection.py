@@ -0,0 +1,48 @@
+from app.domain.cart.aggregate import CartAggregate, CartItem
+from app.infrastructure.repositories.read_model import ReadModelRepository
+
+
+def project_items(items: dict[str, CartItem]) -> tuple[list[dict], float, int]:
+    """
+    Build read model items list and cart totals in a single pass.
+
+    Items stay as dict literals on purpose - the read model stores and the API
+    returns a JSON list of objects, so a columnar form would only be zipped
+    back into the same dicts at the repository boundary.
+
+    Returns:
+        (items as dicts, total_amount, item_count)
+    """
+    rows = []
+    append = rows.append
+    total_amount = 0
+    item_count = 0
+    for item in items.values():
+        total_price = item.price * item.quantity
+        append(
+            {
+                "product_id": item.product_id,
+                "product_name": item.product_name,
+                "price": item.price,
+                "quantity": item.quantity,
+                "total_price": total_price,
+            }
+        )
+        total_amount += total_price
+        item_count += item.quantity
+    return rows, total_amount, item_count
+
+
+async def project_cart(read_model_repo: ReadModelRepository, aggregate: CartAggregate) -> None:
+    """Update cart read model projection from aggregate state"""
+    items, total_amount, item_count = project_items(aggregate.items)
+
+    await read_model_repo.update_projection(
+        cart_id=aggregate.cart_id,
+        status=aggregate.status,
+        items=items,
+        total_amount=total_amount,
+        item_count=item_count,
+        version=aggregate.version,
+        last_activity=aggregate.last_activity,
+    )
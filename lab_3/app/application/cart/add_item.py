@@ -4,6 +4,7 @@ import httpx
 from app.domain.cart.commands import AddItemToCart
 from app.infrastructure.repositories.event_store import EventStore, ConcurrencyException
 from app.infrastructure.repositories.read_model import ReadModelRepository
+from app.application.cart._projection import project_cart
 
 
 class ProductNotFoundError(Exception):
@@ -25,10 +26,11 @@ class AddItemToCartUseCase:
     Retry w przypadku ConcurrencyException (optimistic locking conflict).
     """
 
-    def __init__(self, session: AsyncSession, products_service_url: str):
+    def __init__(self, session: AsyncSession, products_client: httpx.AsyncClient):
         self.event_store = EventStore(session)
         self.read_model_repo = ReadModelRepository(session)
-        self.products_service_url = products_service_url
+        # Współdzielony klient (base_url = serwis produktów) - keep-alive między requestami
+        self.products_client = products_client
 
     async def execute(self, command: AddItemToCart, max_retries: int = 3) -> None:
         """
@@ -75,14 +77,15 @@ class AddItemToCartUseCase:
         )
 
         # Zapisz eventy (optimistic locking)
-        uncommitted_events = aggregate.get_uncommitted_events()
+        uncommitted_events = aggregate.pop_uncommitted_events()
         await self.event_store.save_events(
             aggregate_id=command.cart_id,
             events=uncommitted_events,
             expected_version=aggregate.version - len(uncommitted_events),
+            commit=False,
         )
 
-        # Zaktualizuj read model
+        # Zaktualizuj read model - commit eventów i projekcji razem
         await self._update_read_model(aggregate)
 
     async def _fetch_product(self, product_id: str) -> dict:
@@ -92,40 +95,17 @@ class AddItemToCartUseCase:
         Returns:
             dict: {id, name, price, stock}
         """
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    f"{self.products_service_url}/products/{product_id}",
-                    timeout=5.0,
-                )
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                if e.response.status_code == 404:
-                    raise ProductNotFoundError(f"Product {product_id} not found")
-                raise
-            except httpx.RequestError as e:
-                raise Exception(f"Failed to fetch product: {str(e)}")
+        try:
+            response = await self.products_client.get(f"/products/{product_id}")
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                raise ProductNotFoundError(f"Product {product_id} not found")
+            raise
+        except httpx.RequestError as e:
+            raise Exception(f"Failed to fetch product: {str(e)}")
 
     async def _update_read_model(self, aggregate) -> None:
         """Update read model projection from aggregate state"""
-        items = [
-            {
-                "product_id": item.product_id,
-                "product_name": item.product_name,
-                "price": item.price,
-                "quantity": item.quantity,
-                "total_price": item.total_price,
-            }
-            for item in aggregate.items.values()
-        ]
-
-        await self.read_model_repo.update_projection(
-            cart_id=aggregate.cart_id,
-            status=aggregate.status,
-            items=items,
-            total_amount=aggregate.total_amount,
-            item_count=aggregate.item_count,
-            version=aggregate.version,
-            last_activity=aggregate.last_activity,
-        )
+        await project_cart(self.read_model_repo, aggregate)
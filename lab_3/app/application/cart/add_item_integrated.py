@@ -1,11 +1,20 @@
+import asyncio
+import logging
+from functools import cached_property
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.domain.cart.aggregate import CartAggregate
 from app.domain.cart.commands import AddItemToCart
 from app.domain.product.commands import ReserveStock, ReleaseReservation
 from app.infrastructure.repositories.event_store import EventStore, ConcurrencyException
 from app.infrastructure.repositories.read_model import ReadModelRepository
 from app.infrastructure.repositories.product_read_model import ProductReadModelRepository
 from app.application.product.reserve_stock import ReserveStockUseCase, ReleaseReservationUseCase
+from app.application.cart._projection import project_cart
+
+
+logger = logging.getLogger(__name__)
 
 
 class ProductNotFoundError(Exception):
@@ -24,14 +33,35 @@ class AddItemToCartIntegratedUseCase:
     4. If cart operation fails, releases reservation
     
     This ensures products are reserved when added to cart.
+
+    Dependencies are created lazily on first use.
+
+    Reservation rollback is best-effort, so it runs as a background task
+    and the primary error is raised immediately. Tasks are kept in
+    _supervised (so they aren't garbage collected mid-flight) and awaited
+    on shutdown via wait_for_rollbacks().
     """
 
+    _supervised: set[asyncio.Task] = set()
+
     def __init__(self, session: AsyncSession):
-        self.cart_event_store = EventStore(session)
-        self.cart_read_model_repo = ReadModelRepository(session)
-        self.product_read_model_repo = ProductReadModelRepository(session)
-        self.reserve_stock_use_case = ReserveStockUseCase(session)
-        self.release_reservation_use_case = ReleaseReservationUseCase(session)
+        self.session = session
+
+    @cached_property
+    def cart_event_store(self) -> EventStore:
+        return EventStore(self.session)
+
+    @cached_property
+    def cart_read_model_repo(self) -> ReadModelRepository:
+        return ReadModelRepository(self.session)
+
+    @cached_property
+    def product_read_model_repo(self) -> ProductReadModelRepository:
+        return ProductReadModelRepository(self.session)
+
+    @cached_property
+    def reserve_stock_use_case(self) -> ReserveStockUseCase:
+        return ReserveStockUseCase(self.session)
 
     async def execute(self, command: AddItemToCart, max_retries: int = 3) -> None:
         """
@@ -51,6 +81,13 @@ class AddItemToCartIntegratedUseCase:
         if product is None:
             raise ProductNotFoundError(f"Product {command.product_id} not found")
 
+        # Load cart up front - a missing cart fails before any stock is reserved,
+        # and the first attempt reuses this aggregate instead of replaying again.
+        # (Both reads share one AsyncSession, so they can't run concurrently.)
+        aggregate = await self.cart_event_store.load_aggregate(command.cart_id)
+        if aggregate is None:
+            raise ValueError(f"Cart {command.cart_id} not found")
+
         # 2. Reserve stock first
         try:
             reserve_command = ReserveStock(
@@ -67,21 +104,39 @@ class AddItemToCartIntegratedUseCase:
         try:
             for attempt in range(max_retries):
                 try:
-                    await self._execute_cart_operation(command, product)
+                    await self._execute_cart_operation(command, product, aggregate)
                     return  # Success!
                 except ConcurrencyException:
                     if attempt == max_retries - 1:
                         raise
+                    aggregate = None  # Stale - reload on retry
                     continue
         except Exception as e:
-            # Cart operation failed - release the reservation
-            await self._rollback_reservation(command)
+            # Cart operation failed - release the reservation in background
+            self._schedule_rollback(command)
             raise
 
-    async def _execute_cart_operation(self, command: AddItemToCart, product) -> None:
-        """Execute cart operation (add item)"""
-        # Load cart aggregate
-        aggregate = await self.cart_event_store.load_aggregate(command.cart_id)
+    @classmethod
+    async def wait_for_rollbacks(cls) -> None:
+        """Wait for pending background rollbacks (call on shutdown)"""
+        if cls._supervised:
+            await asyncio.gather(*cls._supervised, return_exceptions=True)
+
+    def _schedule_rollback(self, command: AddItemToCart) -> None:
+        """Start reservation rollback without waiting for it"""
+        task = asyncio.create_task(self._rollback_reservation(command))
+        self._supervised.add(task)
+        task.add_done_callback(self._supervised.discard)
+
+    async def _execute_cart_operation(
+        self,
+        command: AddItemToCart,
+        product,
+        aggregate: CartAggregate | None = None,
+    ) -> None:
+        """Execute cart operation (add item), loading the cart if not given"""
+        if aggregate is None:
+            aggregate = await self.cart_event_store.load_aggregate(command.cart_id)
         
         if aggregate is None:
             raise ValueError(f"Cart {command.cart_id} not found")
@@ -95,38 +150,20 @@ class AddItemToCartIntegratedUseCase:
         )
 
         # Save events
-        uncommitted_events = aggregate.get_uncommitted_events()
+        uncommitted_events = aggregate.pop_uncommitted_events()
         await self.cart_event_store.save_events(
             aggregate_id=command.cart_id,
             events=uncommitted_events,
             expected_version=aggregate.version - len(uncommitted_events),
+            commit=False,
         )
 
-        # Update read model
+        # Update read model - commits events and projection together
         await self._update_cart_read_model(aggregate)
 
     async def _update_cart_read_model(self, aggregate) -> None:
         """Update cart read model projection"""
-        items = [
-            {
-                "product_id": item.product_id,
-                "product_name": item.product_name,
-                "price": item.price,
-                "quantity": item.quantity,
-                "total_price": item.total_price,
-            }
-            for item in aggregate.items.values()
-        ]
-
-        await self.cart_read_model_repo.update_projection(
-            cart_id=aggregate.cart_id,
-            status=aggregate.status,
-            items=items,
-            total_amount=aggregate.total_amount,
-            item_count=aggregate.item_count,
-            version=aggregate.version,
-            last_activity=aggregate.last_activity,
-        )
+        await project_cart(self.cart_read_model_repo, aggregate)
 
     async def _rollback_reservation(self, command: AddItemToCart) -> None:
         """Rollback stock reservation if cart operation fails"""
@@ -136,7 +173,15 @@ class AddItemToCartIntegratedUseCase:
                 cart_id=command.cart_id,
                 reason="cart_operation_failed"
             )
-            await self.release_reservation_use_case.execute(release_command)
+            # Own session - the request session is closed once the error
+            # response has been sent, possibly before this task runs
+            async with AsyncSession(self.session.bind, expire_on_commit=False) as session:
+                await ReleaseReservationUseCase(session).execute(release_command)
         except Exception as e:
             # Log error but don't fail - we already have a primary error
-            print(f"Warning: Failed to release reservation during rollback: {e}")
+            logger.warning(
+                "Rollback failed for cart=%s product=%s: %s",
+                command.cart_id,
+                command.product_id,
+                e,
+            )
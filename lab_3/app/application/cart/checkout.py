@@ -4,6 +4,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.domain.cart.commands import CheckoutCart
 from app.infrastructure.repositories.event_store import EventStore, ConcurrencyException
 from app.infrastructure.repositories.read_model import ReadModelRepository
+from app.application.cart._projection import project_cart
 
 
 class CheckoutCartUseCase:
@@ -53,14 +54,15 @@ class CheckoutCartUseCase:
         aggregate.checkout(order_id=command.order_id)
 
         # Zapisz eventy
-        uncommitted_events = aggregate.get_uncommitted_events()
+        uncommitted_events = aggregate.pop_uncommitted_events()
         await self.event_store.save_events(
             aggregate_id=command.cart_id,
             events=uncommitted_events,
             expected_version=aggregate.version - len(uncommitted_events),
+            commit=False,
         )
 
-        # Zaktualizuj read model
+        # Zaktualizuj read model - commit eventów i projekcji razem
         await self._update_read_model(aggregate)
 
         # TODO: Publish CartCheckedOut event to message broker
@@ -74,23 +76,4 @@ class CheckoutCartUseCase:
 
     async def _update_read_model(self, aggregate) -> None:
         """Update read model projection"""
-        items = [
-            {
-                "product_id": item.product_id,
-                "product_name": item.product_name,
-                "price": item.price,
-                "quantity": item.quantity,
-                "total_price": item.total_price,
-            }
-            for item in aggregate.items.values()
-        ]
-
-        await self.read_model_repo.update_projection(
-            cart_id=aggregate.cart_id,
-            status=aggregate.status,
-            items=items,
-            total_amount=aggregate.total_amount,
-            item_count=aggregate.item_count,
-            version=aggregate.version,
-            last_activity=aggregate.last_activity,
-        )
+        await project_cart(self.read_model_repo, aggregate)
@@ -1,3 +1,5 @@
+import logging
+from functools import cached_property
 from uuid import uuid4
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -6,6 +8,10 @@ from app.domain.product.commands import CheckoutReservation
 from app.infrastructure.repositories.event_store import EventStore, ConcurrencyException
 from app.infrastructure.repositories.read_model import ReadModelRepository
 from app.application.product.reserve_stock import CheckoutReservationUseCase
+from app.application.cart._projection import project_cart
+
+
+logger = logging.getLogger(__name__)
 
 
 class CheckoutCartIntegratedUseCase:
@@ -21,9 +27,14 @@ class CheckoutCartIntegratedUseCase:
     """
 
     def __init__(self, session: AsyncSession):
+        self.session = session
         self.event_store = EventStore(session)
         self.read_model_repo = ReadModelRepository(session)
-        self.checkout_reservation_use_case = CheckoutReservationUseCase(session)
+
+    @cached_property
+    def checkout_reservation_use_case(self) -> CheckoutReservationUseCase:
+        """Created on first use - not needed if cart checkout fails"""
+        return CheckoutReservationUseCase(self.session)
 
     async def execute(self, command: CheckoutCart, max_retries: int = 3):
         """Execute checkout command with product reservation completion"""
@@ -53,14 +64,15 @@ class CheckoutCartIntegratedUseCase:
         aggregate.checkout(order_id=command.order_id)
 
         # Save cart events
-        uncommitted_events = aggregate.get_uncommitted_events()
+        uncommitted_events = aggregate.pop_uncommitted_events()
         await self.event_store.save_events(
             aggregate_id=command.cart_id,
             events=uncommitted_events,
             expected_version=aggregate.version - len(uncommitted_events),
+            commit=False,
         )
 
-        # Update cart read model
+        # Update cart read model - commits events and projection together
         await self._update_read_model(aggregate)
 
         # Complete all product reservations (release + decrease stock)
@@ -75,7 +87,12 @@ class CheckoutCartIntegratedUseCase:
             except Exception as e:
                 # Log error but don't fail checkout
                 # In production, this should trigger compensation logic
-                print(f"Warning: Failed to checkout reservation for {product_id}: {e}")
+                logger.warning(
+                    "Checkout reservation failed for cart=%s product=%s: %s",
+                    command.cart_id,
+                    product_id,
+                    e,
+                )
 
         return {
             "order_id": command.order_id,
@@ -85,23 +102,4 @@ class CheckoutCartIntegratedUseCase:
 
     async def _update_read_model(self, aggregate) -> None:
         """Update read model projection"""
-        items = [
-            {
-                "product_id": item.product_id,
-                "product_name": item.product_name,
-                "price": item.price,
-                "quantity": item.quantity,
-                "total_price": item.total_price,
-            }
-            for item in aggregate.items.values()
-        ]
-
-        await self.read_model_repo.update_projection(
-            cart_id=aggregate.cart_id,
-            status=aggregate.status,
-            items=items,
-            total_amount=aggregate.total_amount,
-            item_count=aggregate.item_count,
-            version=aggregate.version,
-            last_activity=aggregate.last_activity,
-        )
+        await project_cart(self.read_model_repo, aggregate)
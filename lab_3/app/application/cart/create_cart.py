@@ -3,7 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.cart.aggregate import CartAggregate
 from app.domain.cart.commands import CreateCart
-from app.infrastructure.repositories.event_store import EventStore
+from app.infrastructure.repositories.event_store import EventStore, ConcurrencyException
 from app.infrastructure.repositories.read_model import ReadModelRepository
 
 
@@ -32,24 +32,25 @@ class CreateCartUseCase:
         Returns:
             cart_id: ID utworzonego koszyka
         """
-        # Sprawdź czy koszyk już istnieje
-        existing = await self.event_store.load_aggregate(command.cart_id)
-        if existing is not None:
-            raise ValueError(f"Cart {command.cart_id} already exists")
-
         # Utwórz nowy agregat i wykonaj komendę
         aggregate = CartAggregate(command.cart_id)
         aggregate.create(user_id=command.user_id)
 
-        # Zapisz eventy (optimistic locking - expected_version=0 dla nowego)
-        uncommitted_events = aggregate.get_uncommitted_events()
-        await self.event_store.save_events(
-            aggregate_id=command.cart_id,
-            events=uncommitted_events,
-            expected_version=0,
-        )
-
-        # Zaktualizuj read model
+        # Zapisz eventy (optimistic locking - expected_version=0 dla nowego).
+        # Konflikt wersji oznacza, że koszyk o tym ID już istnieje - nie trzeba
+        # wcześniej odtwarzać agregatu, żeby to sprawdzić.
+        uncommitted_events = aggregate.pop_uncommitted_events()
+        try:
+            await self.event_store.save_events(
+                aggregate_id=command.cart_id,
+                events=uncommitted_events,
+                expected_version=0,
+                commit=False,
+            )
+        except ConcurrencyException as e:
+            raise ValueError(f"Cart {command.cart_id} already exists") from e
+
+        # Zaktualizuj read model - commit eventów i projekcji razem
         await self.read_model_repo.create_projection(
             cart_id=command.cart_id,
             user_id=command.user_id,
@@ -1,12 +1,23 @@
 import asyncio
+import heapq
+import logging
+import time
+from functools import cached_property
+from datetime import datetime, timedelta, timezone
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.domain._time import epoch_seconds
+from app.domain.cart.aggregate import CartAggregate
 from app.domain.cart.commands import ExpireCart
 from app.domain.product.commands import ReleaseReservation
-from app.infrastructure.repositories.event_store import EventStore
+from app.infrastructure.repositories.event_store import EventStore, ConcurrencyException
 from app.infrastructure.repositories.read_model import ReadModelRepository
 from app.application.product.reserve_stock import ReleaseReservationUseCase
+from app.application.cart._projection import project_cart
+
+
+logger = logging.getLogger(__name__)
 
 
 class ExpireCartUseCase:
@@ -17,31 +28,45 @@ class ExpireCartUseCase:
     """
 
     def __init__(self, session: AsyncSession):
+        self.session = session
         self.event_store = EventStore(session)
         self.read_model_repo = ReadModelRepository(session)
-        self.release_reservation_use_case = ReleaseReservationUseCase(session)
 
-    async def execute(self, command: ExpireCart) -> None:
+    @cached_property
+    def release_reservation_use_case(self) -> ReleaseReservationUseCase:
+        """Created on first use - skipped carts never need it"""
+        return ReleaseReservationUseCase(self.session)
+
+    async def execute(self, command: ExpireCart) -> CartAggregate | None:
         """
         Execute expire cart command.
         
         Steps:
+        0. Skip carts that are no longer PENDING in read model
         1. Load cart aggregate
         2. Get all products in cart
         3. Expire cart (generates CartExpired event)
         4. Release all product reservations
         5. Update read model
+
+        Returns:
+            Expired aggregate, or None if nothing was expired
         """
+        # Cheap projection check - skip replay for carts that were
+        # checked out / expired after get_expired_carts picked them up
+        if not await self.read_model_repo.is_pending(command.cart_id):
+            return None
+
         # Load cart aggregate
         aggregate = await self.event_store.load_aggregate(command.cart_id)
         
         if aggregate is None:
             # Already deleted or doesn't exist
-            return
+            return None
         
         if aggregate.status != "PENDING":
             # Already checked out or expired
-            return
+            return None
 
         # Get products to release
         products_to_release = [
@@ -53,57 +78,63 @@ class ExpireCartUseCase:
         aggregate.expire(reason=command.reason)
 
         # Save events
-        uncommitted_events = aggregate.get_uncommitted_events()
+        uncommitted_events = aggregate.pop_uncommitted_events()
         await self.event_store.save_events(
             aggregate_id=command.cart_id,
             events=uncommitted_events,
             expected_version=aggregate.version - len(uncommitted_events),
+            commit=False,
         )
 
-        # Update read model
+        # Update read model - commits events and projection together
         await self._update_read_model(aggregate)
 
         # Release all product reservations
-        for product_id, quantity in products_to_release:
-            try:
-                release_command = ReleaseReservation(
-                    product_id=product_id,
-                    cart_id=command.cart_id,
-                    reason="cart_expired"
-                )
-                await self.release_reservation_use_case.execute(release_command)
-            except Exception as e:
-                print(f"Warning: Failed to release reservation for {product_id}: {e}")
+        await release_cart_reservations(
+            self.release_reservation_use_case,
+            command.cart_id,
+            [product_id for product_id, _ in products_to_release],
+        )
+
+        return aggregate
 
     async def _update_read_model(self, aggregate) -> None:
         """Update read model projection"""
-        items = [
-            {
-                "product_id": item.product_id,
-                "product_name": item.product_name,
-                "price": item.price,
-                "quantity": item.quantity,
-                "total_price": item.total_price,
-            }
-            for item in aggregate.items.values()
-        ]
+        await project_cart(self.read_model_repo, aggregate)
 
-        await self.read_model_repo.update_projection(
-            cart_id=aggregate.cart_id,
-            status=aggregate.status,
-            items=items,
-            total_amount=aggregate.total_amount,
-            item_count=aggregate.item_count,
-            version=aggregate.version,
-            last_activity=aggregate.last_activity,
-        )
+
+async def release_cart_reservations(
+    use_case: ReleaseReservationUseCase,
+    cart_id: UUID,
+    product_ids: list[str],
+) -> None:
+    """Release reservations of an expired cart - failures are only logged"""
+    for product_id in product_ids:
+        try:
+            release_command = ReleaseReservation(
+                product_id=product_id, cart_id=cart_id, reason="cart_expired"
+            )
+            await use_case.execute(release_command)
+        except Exception as e:
+            logger.warning(
+                "Release reservation failed for cart=%s product=%s: %s",
+                cart_id,
+                product_id,
+                e,
+            )
 
 
 class CartExpirationBackgroundTask:
     """
-    Background task that periodically checks for expired carts.
+    Background task that expires carts inactive for 15+ minutes.
     
-    Runs every 1 minute and expires carts inactive for 15+ minutes.
+    Keeps a min-heap of (expiry deadline, cart_id) built from the read model
+    and sleeps until the nearest deadline instead of polling blindly.
+    The heap is rebuilt every interval_seconds and holds only carts whose
+    deadline falls before the next rebuild - later ones (incl. carts
+    created meanwhile) are picked up by a following rebuild in time.
+    Stale entries (carts touched since) are filtered out by the read model
+    query when the deadline fires.
     """
 
     def __init__(self, db_factory, interval_seconds: int = 60, timeout_minutes: int = 15):
@@ -112,6 +143,7 @@ class CartExpirationBackgroundTask:
         self.timeout_minutes = timeout_minutes
         self._task = None
         self._running = False
+        self._heap: list[tuple[float, UUID]] = []
 
     async def start(self) -> None:
         """Start the background task"""
@@ -120,7 +152,11 @@ class CartExpirationBackgroundTask:
         
         self._running = True
         self._task = asyncio.create_task(self._run())
-        print(f"Cart expiration task started (check interval: {self.interval_seconds}s, timeout: {self.timeout_minutes}m)")
+        logger.info(
+            "Cart expiration task started (check interval: %ss, timeout: %sm)",
+            self.interval_seconds,
+            self.timeout_minutes,
+        )
 
     async def stop(self) -> None:
         """Stop the background task"""
@@ -131,48 +167,133 @@ class CartExpirationBackgroundTask:
                 await self._task
             except asyncio.CancelledError:
                 pass
-        print("Cart expiration task stopped")
+        logger.info("Cart expiration task stopped")
 
     async def _run(self) -> None:
-        """Main task loop"""
+        """Main task loop - sleep until next deadline or heap rebuild"""
+        next_rebuild = 0.0
         while self._running:
             try:
-                await self._check_and_expire_carts()
+                now = time.time()
+                if now >= next_rebuild:
+                    next_rebuild = now + self.interval_seconds
+                    await self._rebuild_heap()
+
+                if self._heap and self._heap[0][0] <= now:
+                    while self._heap and self._heap[0][0] <= now:
+                        heapq.heappop(self._heap)
+                    await self._check_and_expire_carts()
             except Exception as e:
-                print(f"Error in cart expiration task: {e}")
-            
-            await asyncio.sleep(self.interval_seconds)
+                logger.error("Error in cart expiration task: %s", e)
+
+            wake_at = next_rebuild
+            if self._heap:
+                wake_at = min(wake_at, self._heap[0][0])
+            await asyncio.sleep(max(0.0, wake_at - time.time()))
+
+    async def _rebuild_heap(self) -> None:
+        """Rebuild deadline heap from carts expiring before the next rebuild"""
+        timeout = timedelta(minutes=self.timeout_minutes)
+        async with self.db_factory() as session:
+            read_model_repo = ReadModelRepository(session)
+            pending = await read_model_repo.get_expiring_activity(
+                timeout_minutes=self.timeout_minutes,
+                within_seconds=self.interval_seconds,
+            )
+
+        heap = [
+            (epoch_seconds(last_activity + timeout), cart_id) for cart_id, last_activity in pending
+        ]
+        heapq.heapify(heap)
+        self._heap = heap
 
     async def _check_and_expire_carts(self) -> None:
-        """Check for expired carts and expire them"""
-        async for session in self.db_factory():
-            try:
-                # Get expired cart IDs from read model
-                read_model_repo = ReadModelRepository(session)
-                expired_cart_ids = await read_model_repo.get_expired_carts(
-                    timeout_minutes=self.timeout_minutes
-                )
+        """
+        Expire all inactive carts as one batch: versions come from the read
+        model, CartExpired events go out in one executemany and the projection
+        in one UPDATE. If a cart changed meanwhile the batch is rolled back
+        and carts are expired one by one (replay skips the active ones).
 
-                if not expired_cart_ids:
+        Every uvicorn worker runs this task, so a pass first takes an advisory
+        lock in a separate transaction (held until the pass ends); workers
+        that don't get it skip the pass instead of racing on the same carts.
+        """
+        async with self.db_factory() as lock_session:
+            try:
+                if not await ReadModelRepository(lock_session).try_lock_expiration():
                     return
 
-                print(f"Found {len(expired_cart_ids)} expired carts")
-
-                # Expire each cart
-                for cart_id in expired_cart_ids:
+                async with self.db_factory() as session:
                     try:
-                        command = ExpireCart(
-                            cart_id=cart_id,
-                            reason=f"{self.timeout_minutes}_minute_timeout"
+                        expired = await self._bulk_expire(session)
+                    except ConcurrencyException:
+                        logger.info("Bulk expiration conflicted, expiring carts one by one")
+                        await self._expire_one_by_one(session)
+                        return
+
+                    release_use_case = ReleaseReservationUseCase(session)
+                    for cart_id, items in expired:
+                        await release_cart_reservations(
+                            release_use_case, cart_id, [item["product_id"] for item in items]
                         )
-                        
-                        use_case = ExpireCartUseCase(session)
-                        await use_case.execute(command)
-                        print(f"Expired cart: {cart_id}")
-                    except Exception as e:
-                        print(f"Failed to expire cart {cart_id}: {e}")
+            except Exception as e:
+                logger.error("Error checking expired carts: %s", e)
+
+    async def _bulk_expire(self, session: AsyncSession) -> list[tuple[UUID, list[dict]]]:
+        """
+        SELECT + one events INSERT + one projection UPDATE for the whole batch.
+        Events are written before the projection, same order as every other
+        writer, so a concurrent command conflicts on the events index.
 
+        Returns:
+            (cart_id, items) of expired carts
+        """
+        read_model_repo = ReadModelRepository(session)
+        states = await read_model_repo.get_expired_cart_states(timeout_minutes=self.timeout_minutes)
+        if not states:
+            return []
+
+        reason = f"{self.timeout_minutes}_minute_timeout"
+        expired_at = datetime.now(timezone.utc)
+        events = [
+            CartAggregate.expired_event(cart_id, version + 1, reason, occurred_at=expired_at)
+            for cart_id, version, _ in states
+        ]
+        await EventStore(session).save_many(events, commit=False)
+
+        # Commits events and projection together
+        await read_model_repo.bulk_mark_expired(
+            {event.aggregate_id: event.aggregate_version for event in events},
+            expired_at=expired_at,
+        )
+        logger.info("Expired %d carts", len(states))
+        return [(cart_id, items) for cart_id, _, items in states]
+
+    async def _expire_one_by_one(self, session: AsyncSession) -> None:
+        """Fallback - replay and expire every cart separately"""
+        # Get expired cart IDs from read model
+        read_model_repo = ReadModelRepository(session)
+        expired_cart_ids = await read_model_repo.get_expired_carts(
+            timeout_minutes=self.timeout_minutes
+        )
+
+        if not expired_cart_ids:
+            return
+
+        logger.info("Found %d expired carts", len(expired_cart_ids))
+
+        # Each cart commits its events and projection together, so a crash
+        # mid-loop can't leave committed CartExpired events behind a PENDING row
+        use_case = ExpireCartUseCase(session)
+        for cart_id in expired_cart_ids:
+            try:
+                command = ExpireCart(
+                    cart_id=cart_id, reason=f"{self.timeout_minutes}_minute_timeout"
+                )
+                
+                if await use_case.execute(command) is not None:
+                    logger.info("Expired cart: %s", cart_id)
             except Exception as e:
-                print(f"Error checking expired carts: {e}")
-            finally:
-                await session.close()
+                await session.rollback()
+                logger.warning("Failed to expire cart %s: %s", cart_id, e)
+
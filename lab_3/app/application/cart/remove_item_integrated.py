@@ -1,3 +1,6 @@
+import logging
+from functools import cached_property
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.cart.commands import RemoveItemFromCart
@@ -5,6 +8,10 @@ from app.domain.product.commands import ReleaseReservation
 from app.infrastructure.repositories.event_store import EventStore, ConcurrencyException
 from app.infrastructure.repositories.read_model import ReadModelRepository
 from app.application.product.reserve_stock import ReleaseReservationUseCase
+from app.application.cart._projection import project_cart
+
+
+logger = logging.getLogger(__name__)
 
 
 class RemoveItemFromCartIntegratedUseCase:
@@ -16,9 +23,14 @@ class RemoveItemFromCartIntegratedUseCase:
     """
 
     def __init__(self, session: AsyncSession):
+        self.session = session
         self.event_store = EventStore(session)
         self.read_model_repo = ReadModelRepository(session)
-        self.release_reservation_use_case = ReleaseReservationUseCase(session)
+
+    @cached_property
+    def release_reservation_use_case(self) -> ReleaseReservationUseCase:
+        """Created on first use - not needed if cart operation fails"""
+        return ReleaseReservationUseCase(self.session)
 
     async def execute(self, command: RemoveItemFromCart, max_retries: int = 3) -> None:
         """Execute remove item command with stock reservation release"""
@@ -49,14 +61,15 @@ class RemoveItemFromCartIntegratedUseCase:
         aggregate.remove_item(product_id=command.product_id)
 
         # Save cart events
-        uncommitted_events = aggregate.get_uncommitted_events()
+        uncommitted_events = aggregate.pop_uncommitted_events()
         await self.event_store.save_events(
             aggregate_id=command.cart_id,
             events=uncommitted_events,
             expected_version=aggregate.version - len(uncommitted_events),
+            commit=False,
         )
 
-        # Update cart read model
+        # Update cart read model - commits events and projection together
         await self._update_read_model(aggregate)
 
         # Release product reservation
@@ -68,27 +81,13 @@ class RemoveItemFromCartIntegratedUseCase:
             )
             await self.release_reservation_use_case.execute(release_command)
         except Exception as e:
-            print(f"Warning: Failed to release reservation for {product_id}: {e}")
+            logger.warning(
+                "Release reservation failed for cart=%s product=%s: %s",
+                command.cart_id,
+                product_id,
+                e,
+            )
 
     async def _update_read_model(self, aggregate) -> None:
         """Update read model projection"""
-        items = [
-            {
-                "product_id": item.product_id,
-                "product_name": item.product_name,
-                "price": item.price,
-                "quantity": item.quantity,
-                "total_price": item.total_price,
-            }
-            for item in aggregate.items.values()
-        ]
-
-        await self.read_model_repo.update_projection(
-            cart_id=aggregate.cart_id,
-            status=aggregate.status,
-            items=items,
-            total_amount=aggregate.total_amount,
-            item_count=aggregate.item_count,
-            version=aggregate.version,
-            last_activity=aggregate.last_activity,
-        )
+        await project_cart(self.read_model_repo, aggregate)
@@ -1,7 +1,11 @@
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.infrastructure.repositories.read_model import ReadModelRepository, CartReadModel
+from app.infrastructure.repositories.read_model import (
+    ReadModelRepository,
+    CartReadModel,
+    CartSummary,
+)
 
 
 class ViewCartQuery:
@@ -31,7 +35,7 @@ class ViewUserCartsQuery:
     def __init__(self, session: AsyncSession):
         self.read_model_repo = ReadModelRepository(session)
 
-    async def execute(self, user_id: str, status: str | None = None) -> list[CartReadModel]:
+    async def execute(self, user_id: str, status: str | None = None) -> list[CartSummary]:
         """
         Get all carts for user, optionally filtered by status.
         
@@ -40,6 +44,6 @@ class ViewUserCartsQuery:
             status: Optional status filter (PENDING, CHECKED_OUT, EXPIRED)
         
         Returns:
-            List of user's carts
+            List of user's carts (without items - list view)
         """
-        return await self.read_model_repo.get_user_carts(user_id, status)
+        return await self.read_model_repo.get_user_cart_summaries(user_id, status)
@@ -0,0 +1,105 @@
+import asyncio
+import logging
+from typing import Callable
+
+from app.infrastructure.repositories.product_event_store import ProductEventStore
+from app.infrastructure.repositories.product_read_model import ProductReadModelRepository
+
+logger = logging.getLogger(__name__)
+
+
+class ProductProjectionWorker:
+    """
+    Background task that applies the product read model from product_outbox.
+
+    Reservation commands commit only events + outbox rows, so the projection
+    UPDATE is off the request path (read model is eventually consistent anyway).
+    Each batch claims rows with FOR UPDATE SKIP LOCKED, projects every
+    touched product once from its current aggregate state and deletes the
+    rows in the same transaction, so the outbox holds only the backlog.
+    Several workers (processes, services) may run at once.
+    on_projected(product_id) is called after commit (e.g. cache invalidation).
+    """
+
+    def __init__(
+        self,
+        db_factory,
+        poll_seconds: float = 0.1,
+        batch_size: int = 100,
+        on_projected: Callable[[str], None] | None = None,
+    ):
+        self.db_factory = db_factory
+        self.poll_seconds = poll_seconds
+        self.batch_size = batch_size
+        self.on_projected = on_projected
+        self._task = None
+        self._running = False
+
+    async def start(self) -> None:
+        """Start the background task"""
+        if self._running:
+            return
+
+        self._running = True
+        self._task = asyncio.create_task(self._run())
+        logger.info("Product projection worker started (poll: %ss)", self.poll_seconds)
+
+    async def stop(self) -> None:
+        """Stop the background task"""
+        self._running = False
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        logger.info("Product projection worker stopped")
+
+    async def _run(self) -> None:
+        """Main loop - drain full batches back to back, sleep when idle"""
+        while self._running:
+            try:
+                processed = await self._process_batch()
+            except Exception as e:
+                logger.error("Error in product projection worker: %s", e)
+                processed = 0
+
+            if processed < self.batch_size:
+                await asyncio.sleep(self.poll_seconds)
+
+    async def _process_batch(self) -> int:
+        """Project one batch of outbox rows, returns number of rows claimed"""
+        async with self.db_factory() as session:
+            event_store = ProductEventStore(session)
+            read_model_repo = ProductReadModelRepository(session)
+
+            claimed = await event_store.claim_outbox(self.batch_size)
+            if not claimed:
+                await session.rollback()
+                return 0
+
+            # Several events of one product collapse into one upsert
+            product_ids = list(dict.fromkeys(aggregate_id for _, aggregate_id in claimed))
+            for product_id in product_ids:
+                aggregate = await event_store.load_aggregate(product_id)
+                if aggregate is None:
+                    continue
+                await read_model_repo.update_projection(
+                    product_id=aggregate.product_id,
+                    name=aggregate.name,
+                    price=aggregate.price,
+                    description=aggregate.description,
+                    total_stock=aggregate.total_stock,
+                    reserved_stock=aggregate.reserved_stock,
+                    available_stock=aggregate.available_stock,
+                    version=aggregate.version,
+                    commit=False,
+                )
+
+            await event_store.delete_outbox([row_id for row_id, _ in claimed])
+            await session.commit()
+
+            if self.on_projected is not None:
+                for product_id in product_ids:
+                    self.on_projected(product_id)
+            return len(claimed)
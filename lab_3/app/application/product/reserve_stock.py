@@ -5,7 +5,7 @@ from app.infrastructure.repositories.product_event_store import (
     ProductEventStore,
     ConcurrencyException
 )
-from app.infrastructure.repositories.product_read_model import ProductReadModelRepository
+from app.application._retry import retry_with_backoff
 
 import smtplib
 from email.mime.text import MIMEText
@@ -24,19 +24,17 @@ class ReserveStockUseCase:
     """
 
     def __init__(self, session: AsyncSession):
+        self.session = session
         self.event_store = ProductEventStore(session)
-        self.read_model_repo = ProductReadModelRepository(session)
 
     async def execute(self, command: ReserveStock, max_retries: int = 3) -> None:
         """Execute reserve stock command with retry"""
-        for attempt in range(max_retries):
-            try:
-                await self._execute_once(command)
-                return
-            except ConcurrencyException:
-                if attempt == max_retries - 1:
-                    raise
-                continue
+        await retry_with_backoff(
+            lambda: self._execute_once(command),
+            max_retries,
+            retry_on=ConcurrencyException,
+            name="reserve_stock",
+        )
 
     async def _execute_once(self, command: ReserveStock) -> None:
         """Single execution attempt"""
@@ -53,28 +51,23 @@ class ReserveStockUseCase:
         )
 
         # Save events
-        uncommitted_events = aggregate.get_uncommitted_events()
+        uncommitted_events = aggregate.pop_uncommitted_events()
+        if not uncommitted_events:  # Nothing changed - skip event and read model writes
+            return
+
+        previous_version = aggregate.version - len(uncommitted_events)
         await self.event_store.save_events(
             aggregate_id=command.product_id,
             events=uncommitted_events,
-            expected_version=aggregate.version - len(uncommitted_events),
+            expected_version=previous_version,
+            commit=False,
         )
+        await self.event_store.save_snapshot_if_due(aggregate, previous_version)
 
-        # Update read model
-        await self._update_read_model(aggregate)
-
-    async def _update_read_model(self, aggregate) -> None:
-        """Update read model projection"""
-        await self.read_model_repo.update_projection(
-            product_id=aggregate.product_id,
-            name=aggregate.name,
-            price=aggregate.price,
-            description=aggregate.description,
-            total_stock=aggregate.total_stock,
-            reserved_stock=aggregate.reserved_stock,
-            available_stock=aggregate.available_stock,
-            version=aggregate.version,
-        )
+        # Commit events, outbox rows and snapshot together - the read model
+        # is projected from the outbox by ProductProjectionWorker (started by
+        # both products_service and main_integrated)
+        await self.session.commit()
 
 
 class ReleaseReservationUseCase:
@@ -88,19 +81,17 @@ class ReleaseReservationUseCase:
     """
 
     def __init__(self, session: AsyncSession):
+        self.session = session
         self.event_store = ProductEventStore(session)
-        self.read_model_repo = ProductReadModelRepository(session)
 
     async def execute(self, command: ReleaseReservation, max_retries: int = 3) -> None:
         """Execute release reservation command with retry"""
-        for attempt in range(max_retries):
-            try:
-                await self._execute_once(command)
-                return
-            except ConcurrencyException:
-                if attempt == max_retries - 1:
-                    raise
-                continue
+        await retry_with_backoff(
+            lambda: self._execute_once(command),
+            max_retries,
+            retry_on=ConcurrencyException,
+            name="release_reservation",
+        )
 
     async def _execute_once(self, command: ReleaseReservation) -> None:
         """Single execution attempt"""
@@ -117,29 +108,23 @@ class ReleaseReservationUseCase:
         )
 
         # Save events
-        uncommitted_events = aggregate.get_uncommitted_events()
-        if uncommitted_events:  # May be empty if no reservation existed
-            await self.event_store.save_events(
-                aggregate_id=command.product_id,
-                events=uncommitted_events,
-                expected_version=aggregate.version - len(uncommitted_events),
-            )
-
-            # Update read model
-            await self._update_read_model(aggregate)
-
-    async def _update_read_model(self, aggregate) -> None:
-        """Update read model projection"""
-        await self.read_model_repo.update_projection(
-            product_id=aggregate.product_id,
-            name=aggregate.name,
-            price=aggregate.price,
-            description=aggregate.description,
-            total_stock=aggregate.total_stock,
-            reserved_stock=aggregate.reserved_stock,
-            available_stock=aggregate.available_stock,
-            version=aggregate.version,
+        uncommitted_events = aggregate.pop_uncommitted_events()
+        if not uncommitted_events:  # May be empty if no reservation existed
+            return
+
+        previous_version = aggregate.version - len(uncommitted_events)
+        await self.event_store.save_events(
+            aggregate_id=command.product_id,
+            events=uncommitted_events,
+            expected_version=previous_version,
+            commit=False,
         )
+        await self.event_store.save_snapshot_if_due(aggregate, previous_version)
+
+        # Commit events, outbox rows and snapshot together - the read model
+        # is projected from the outbox by ProductProjectionWorker (started by
+        # both products_service and main_integrated)
+        await self.session.commit()
 
 
 class CheckoutReservationUseCase:
@@ -150,19 +135,17 @@ class CheckoutReservationUseCase:
     """
 
     def __init__(self, session: AsyncSession):
+        self.session = session
         self.event_store = ProductEventStore(session)
-        self.read_model_repo = ProductReadModelRepository(session)
 
     async def execute(self, command: CheckoutReservation, max_retries: int = 3) -> None:
         """Execute checkout reservation command with retry"""
-        for attempt in range(max_retries):
-            try:
-                await self._execute_once(command)
-                return
-            except ConcurrencyException:
-                if attempt == max_retries - 1:
-                    raise
-                continue
+        await retry_with_backoff(
+            lambda: self._execute_once(command),
+            max_retries,
+            retry_on=ConcurrencyException,
+            name="checkout_reservation",
+        )
 
     async def _execute_once(self, command: CheckoutReservation) -> None:
         """Single execution attempt"""
@@ -179,32 +162,27 @@ class CheckoutReservationUseCase:
         )
 
         # Save events
-        uncommitted_events = aggregate.get_uncommitted_events()
+        uncommitted_events = aggregate.pop_uncommitted_events()
+        if not uncommitted_events:  # Nothing changed - skip event and read model writes
+            return
+
+        previous_version = aggregate.version - len(uncommitted_events)
         await self.event_store.save_events(
             aggregate_id=command.product_id,
             events=uncommitted_events,
-            expected_version=aggregate.version - len(uncommitted_events),
+            expected_version=previous_version,
+            commit=False,
         )
+        await self.event_store.save_snapshot_if_due(aggregate, previous_version)
 
-        # Update read model
-        await self._update_read_model(aggregate)
+        # Commit events, outbox rows and snapshot together - the read model
+        # is projected from the outbox by ProductProjectionWorker (started by
+        # both products_service and main_integrated)
+        await self.session.commit()
 
         await self._deliver_email("konrad@example.com", 
                                   f"Your Product {aggregate.product_id} has been sent",
                                   f"Your Product {aggregate.product_id} has been sent")
- 
-    async def _update_read_model(self, aggregate) -> None:
-        """Update read model projection"""
-        await self.read_model_repo.update_projection(
-            product_id=aggregate.product_id,
-            name=aggregate.name,
-            price=aggregate.price,
-            description=aggregate.description,
-            total_stock=aggregate.total_stock,
-            reserved_stock=aggregate.reserved_stock,
-            available_stock=aggregate.available_stock,
-            version=aggregate.version,
-        )
 
     async def _deliver_email(self, recipient: str, content: str, subject: str):
         """
@@ -0,0 +1,15 @@
+import os
+from uuid import UUID
+
+_EVENT_ID_BATCH = 64
+_event_id_pool: list[UUID] = []
+
+
+def next_event_id() -> UUID:
+    """Random (v4) event id taken from a pool refilled with one os.urandom call"""
+    if not _event_id_pool:
+        raw = os.urandom(16 * _EVENT_ID_BATCH)
+        _event_id_pool.extend(
+            UUID(bytes=raw[i : i + 16], version=4) for i in range(0, len(raw), 16)
+        )
+    return _event_id_pool.pop()
@@ -0,0 +1,8 @@
+from datetime import datetime, timezone
+
+
+def epoch_seconds(value: datetime) -> float:
+    """Epoch seconds, treating naive datetimes (older cart events) as UTC"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
@@ -1,7 +1,11 @@
-from datetime import datetime, timedelta
-from typing import Any
-from uuid import UUID, uuid4
-
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, ClassVar
+from uuid import UUID
+
+from app.domain._ids import next_event_id
+from app.domain._time import epoch_seconds
 from app.domain.cart.events import (
     CartCheckedOut,
     CartCreated,
@@ -15,14 +19,13 @@ from app.domain.cart.events import (
 )
 
 
+@dataclass(slots=True)
 class CartItem:
     """Value object representing an item in the cart"""
-    
-    def __init__(self, product_id: str, product_name: str, price: float, quantity: int):
-        self.product_id = product_id
-        self.product_name = product_name
-        self.price = price
-        self.quantity = quantity
+    product_id: str
+    product_name: str
+    price: float
+    quantity: int
 
     @property
     def total_price(self) -> float:
@@ -44,10 +47,13 @@ class CartAggregate:
         self.cart_id = cart_id
         self.user_id: str | None = None
         self.items: dict[str, CartItem] = {}
+        self._item_count: int = 0  # maintained by _apply_* handlers
+        self._total_amount: float = 0.0  # maintained by _apply_* handlers
         self.status: str = "PENDING"  # PENDING, CHECKED_OUT, EXPIRED
         self.version: int = 0
         self.created_at: datetime | None = None
         self.last_activity: datetime | None = None
+        self._last_activity_ts: float | None = None  # epoch seconds, for is_expired
         self.uncommitted_events: list[DomainEvent] = []
 
     # === Event Application (Replay) ===
@@ -58,14 +64,13 @@ class CartAggregate:
         is_new=True: nowy event (dodaj do uncommitted)
         is_new=False: replay z event store (nie dodawaj do uncommitted)
         """
-        # Route to specific handler
-        handler_name = f"_apply_{event.event_type}"
-        handler = getattr(self, handler_name, None)
+        # Route to specific handler (dispatch table built once per class)
+        handler = self._HANDLERS.get(event.event_type)
         
         if handler is None:
             raise ValueError(f"No handler for event type: {event.event_type}")
         
-        handler(event)
+        handler(self, event)
         
         if is_new:
             self.uncommitted_events.append(event)
@@ -75,12 +80,15 @@ class CartAggregate:
         self.status = "PENDING"
         self.created_at = event.occurred_at
         self.last_activity = event.occurred_at
+        self._last_activity_ts = epoch_seconds(event.occurred_at)
         self.version = event.aggregate_version
 
     def _apply_ItemAddedToCart(self, event: ItemAddedToCart) -> None:
-        if event.product_id in self.items:
-            # Jeśli produkt już istnieje, zwiększ quantity
-            self.items[event.product_id].quantity += event.quantity
+        existing = self.items.get(event.product_id)
+        if existing is not None:
+            # Jeśli produkt już istnieje, zwiększ quantity (cena pozycji bez zmian)
+            existing.quantity += event.quantity
+            self._total_amount += existing.price * event.quantity
         else:
             self.items[event.product_id] = CartItem(
                 product_id=event.product_id,
@@ -88,28 +96,42 @@ class CartAggregate:
                 price=event.price,
                 quantity=event.quantity
             )
+            self._total_amount += event.price * event.quantity
+        self._item_count += event.quantity
         self.last_activity = event.occurred_at
+        self._last_activity_ts = epoch_seconds(event.occurred_at)
         self.version = event.aggregate_version
 
     def _apply_ItemRemovedFromCart(self, event: ItemRemovedFromCart) -> None:
-        self.items.pop(event.product_id, None)
+        removed = self.items.pop(event.product_id, None)
+        if removed is not None:
+            self._item_count -= removed.quantity
+            # Pusty koszyk = dokładnie 0.0 (bez dryfu float z odejmowania)
+            self._total_amount = self._total_amount - removed.total_price if self.items else 0.0
         self.last_activity = event.occurred_at
+        self._last_activity_ts = epoch_seconds(event.occurred_at)
         self.version = event.aggregate_version
 
     def _apply_ItemQuantityChanged(self, event: ItemQuantityChanged) -> None:
-        if event.product_id in self.items:
-            self.items[event.product_id].quantity = event.new_quantity
+        item = self.items.get(event.product_id)
+        if item is not None:
+            self._item_count += event.new_quantity - item.quantity
+            self._total_amount += item.price * (event.new_quantity - item.quantity)
+            item.quantity = event.new_quantity
         self.last_activity = event.occurred_at
+        self._last_activity_ts = epoch_seconds(event.occurred_at)
         self.version = event.aggregate_version
 
     def _apply_CartCheckedOut(self, event: CartCheckedOut) -> None:
         self.status = "CHECKED_OUT"
         self.last_activity = event.occurred_at
+        self._last_activity_ts = epoch_seconds(event.occurred_at)
         self.version = event.aggregate_version
 
     def _apply_CartExpired(self, event: CartExpired) -> None:
         self.status = "EXPIRED"
         self.last_activity = event.occurred_at
+        self._last_activity_ts = epoch_seconds(event.occurred_at)
         self.version = event.aggregate_version
 
     def _apply_ProductReserved(self, event: ProductReserved) -> None:
@@ -120,6 +142,18 @@ class CartAggregate:
         # Do implementacji w ramach bonusowych wymagań
         self.version = event.aggregate_version
 
+    # event_type -> handler, used by apply_event instead of getattr per event
+    _HANDLERS: ClassVar[dict[str, Callable[[Any, DomainEvent], None]]] = {
+        "CartCreated": _apply_CartCreated,
+        "ItemAddedToCart": _apply_ItemAddedToCart,
+        "ItemRemovedFromCart": _apply_ItemRemovedFromCart,
+        "ItemQuantityChanged": _apply_ItemQuantityChanged,
+        "CartCheckedOut": _apply_CartCheckedOut,
+        "CartExpired": _apply_CartExpired,
+        "ProductReserved": _apply_ProductReserved,
+        "ProductReservationReleased": _apply_ProductReservationReleased,
+    }
+
     # === Business Logic (Commands) ===
 
     def create(self, user_id: str) -> None:
@@ -128,10 +162,10 @@ class CartAggregate:
             raise ValueError("Cart already created")
 
         event = CartCreated(
-            event_id=uuid4(),
+            event_id=next_event_id(),
             aggregate_id=self.cart_id,
             aggregate_version=self.version + 1,
-            user_id=user_id
+            user_id=user_id,
         )
         self.apply_event(event)
 
@@ -147,13 +181,13 @@ class CartAggregate:
             raise ValueError("Price cannot be negative")
 
         event = ItemAddedToCart(
-            event_id=uuid4(),
+            event_id=next_event_id(),
             aggregate_id=self.cart_id,
             aggregate_version=self.version + 1,
             product_id=product_id,
             product_name=product_name,
             price=price,
-            quantity=quantity
+            quantity=quantity,
         )
         self.apply_event(event)
 
@@ -166,10 +200,10 @@ class CartAggregate:
             raise ValueError(f"Product {product_id} not found in cart")
 
         event = ItemRemovedFromCart(
-            event_id=uuid4(),
+            event_id=next_event_id(),
             aggregate_id=self.cart_id,
             aggregate_version=self.version + 1,
-            product_id=product_id
+            product_id=product_id,
         )
         self.apply_event(event)
 
@@ -187,12 +221,12 @@ class CartAggregate:
         old_quantity = self.items[product_id].quantity
 
         event = ItemQuantityChanged(
-            event_id=uuid4(),
+            event_id=next_event_id(),
             aggregate_id=self.cart_id,
             aggregate_version=self.version + 1,
             product_id=product_id,
             new_quantity=new_quantity,
-            old_quantity=old_quantity
+            old_quantity=old_quantity,
         )
         self.apply_event(event)
 
@@ -204,14 +238,12 @@ class CartAggregate:
         if not self.items:
             raise ValueError("Cannot checkout empty cart")
 
-        total_amount = sum(item.total_price for item in self.items.values())
-
         event = CartCheckedOut(
-            event_id=uuid4(),
+            event_id=next_event_id(),
             aggregate_id=self.cart_id,
             aggregate_version=self.version + 1,
             order_id=order_id,
-            total_amount=total_amount
+            total_amount=self._total_amount,
         )
         self.apply_event(event)
 
@@ -220,33 +252,47 @@ class CartAggregate:
         if self.status != "PENDING":
             raise ValueError(f"Cannot expire cart with status: {self.status}")
 
-        event = CartExpired(
-            event_id=uuid4(),
-            aggregate_id=self.cart_id,
-            aggregate_version=self.version + 1,
-            reason=reason
+        self.apply_event(self.expired_event(self.cart_id, self.version + 1, reason))
+
+    @staticmethod
+    def expired_event(
+        cart_id: UUID,
+        version: int,
+        reason: str,
+        occurred_at: datetime | None = None,
+    ) -> CartExpired:
+        """
+        CartExpired dla wersji version - także dla masowego wygaszania,
+        gdzie wersję bierzemy z read modelu zamiast z replay-u agregatu
+        """
+        fields = {} if occurred_at is None else {"occurred_at": occurred_at}
+        return CartExpired(
+            event_id=next_event_id(),
+            aggregate_id=cart_id,
+            aggregate_version=version,
+            reason=reason,
+            **fields,
         )
-        self.apply_event(event)
 
     # === Helpers ===
 
     @property
     def total_amount(self) -> float:
-        """Calculate total cart amount"""
-        return sum(item.total_price for item in self.items.values())
+        """Get total cart amount"""
+        return self._total_amount
 
     @property
     def item_count(self) -> int:
         """Get total number of items in cart"""
-        return sum(item.quantity for item in self.items.values())
+        return self._item_count
 
     def is_expired(self, timeout_minutes: int = 15) -> bool:
         """Check if cart should be expired based on inactivity"""
-        if self.status != "PENDING" or self.last_activity is None:
-            return False
-        
-        timeout_threshold = datetime.utcnow() - timedelta(minutes=timeout_minutes)
-        return self.last_activity < timeout_threshold
+        return (
+            self.status == "PENDING"
+            and self._last_activity_ts is not None
+            and time.time() - self._last_activity_ts > timeout_minutes * 60
+        )
 
     def clear_uncommitted_events(self) -> None:
         """Clear uncommitted events after persistence"""
@@ -255,3 +301,9 @@ class CartAggregate:
     def get_uncommitted_events(self) -> list[DomainEvent]:
         """Get events that need to be persisted"""
         return self.uncommitted_events.copy()
+
+    def pop_uncommitted_events(self) -> list[DomainEvent]:
+        """Take events that need to be persisted and clear them (no copy)"""
+        events = self.uncommitted_events
+        self.uncommitted_events = []
+        return events
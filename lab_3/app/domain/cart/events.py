@@ -1,7 +1,7 @@
-from datetime import datetime
-from typing import Any
+from datetime import datetime, timezone
+from typing import Any, Literal
 from uuid import UUID
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class DomainEvent(BaseModel):
@@ -9,26 +9,29 @@ class DomainEvent(BaseModel):
     event_id: UUID
     aggregate_id: UUID
     aggregate_version: int
-    occurred_at: datetime = Field(default_factory=datetime.utcnow)
+    occurred_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     event_type: str
 
-    class Config:
-        frozen = True
+    model_config = ConfigDict(frozen=True, extra="forbid")
 
     def to_dict(self) -> dict[str, Any]:
         """Serialize event to dictionary for storage"""
         return self.model_dump(mode='json')
 
+    def to_json(self) -> str:
+        """Serialize event straight to a JSON string (no intermediate dict)"""
+        return self.model_dump_json()
+
 
 class CartCreated(DomainEvent):
     """Event: User created a new shopping cart"""
-    event_type: str = "CartCreated"
+    event_type: Literal["CartCreated"] = "CartCreated"
     user_id: str
 
 
 class ItemAddedToCart(DomainEvent):
     """Event: User added a product to cart"""
-    event_type: str = "ItemAddedToCart"
+    event_type: Literal["ItemAddedToCart"] = "ItemAddedToCart"
     product_id: str
     product_name: str
     price: float
@@ -37,13 +40,13 @@ class ItemAddedToCart(DomainEvent):
 
 class ItemRemovedFromCart(DomainEvent):
     """Event: User removed a product from cart"""
-    event_type: str = "ItemRemovedFromCart"
+    event_type: Literal["ItemRemovedFromCart"] = "ItemRemovedFromCart"
     product_id: str
 
 
 class ItemQuantityChanged(DomainEvent):
     """Event: User changed quantity of a product in cart"""
-    event_type: str = "ItemQuantityChanged"
+    event_type: Literal["ItemQuantityChanged"] = "ItemQuantityChanged"
     product_id: str
     new_quantity: int
     old_quantity: int
@@ -51,26 +54,26 @@ class ItemQuantityChanged(DomainEvent):
 
 class CartCheckedOut(DomainEvent):
     """Event: User finalized cart and created an order"""
-    event_type: str = "CartCheckedOut"
+    event_type: Literal["CartCheckedOut"] = "CartCheckedOut"
     order_id: UUID
     total_amount: float
 
 
 class CartExpired(DomainEvent):
     """Event: Cart expired due to 15min timeout (optional feature)"""
-    event_type: str = "CartExpired"
+    event_type: Literal["CartExpired"] = "CartExpired"
     reason: str = "15_minute_timeout"
 
 
 class ProductReserved(DomainEvent):
     """Event: Product was reserved in this cart (optional feature)"""
-    event_type: str = "ProductReserved"
+    event_type: Literal["ProductReserved"] = "ProductReserved"
     product_id: str
     reserved_until: datetime
 
 
 class ProductReservationReleased(DomainEvent):
     """Event: Product reservation was released (optional feature)"""
-    event_type: str = "ProductReservationReleased"
+    event_type: Literal["ProductReservationReleased"] = "ProductReservationReleased"
     product_id: str
     reason: str
@@ -1,6 +1,11 @@
+import heapq
+import time
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from uuid import UUID, uuid4
+from typing import Any, Callable, ClassVar
+from uuid import UUID
 
+from app.domain._ids import next_event_id
 from app.domain.product.events import (
     DomainEvent,
     ProductCreated,
@@ -8,22 +13,26 @@ from app.domain.product.events import (
     ProductStockReservationReleased,
     ProductStockIncreased,
     ProductStockDecreased,
+    ProductStockSold,
     ProductPriceChanged,
     ProductUpdated,
 )
 
 
+@dataclass(slots=True)
 class StockReservation:
     """Value object representing a stock reservation"""
-    
-    def __init__(self, cart_id: UUID, quantity: int, reserved_until: datetime):
-        self.cart_id = cart_id
-        self.quantity = quantity
-        self.reserved_until = reserved_until
+    cart_id: UUID
+    quantity: int
+    reserved_until: datetime
+    reserved_until_ts: float = field(init=False, compare=False)  # epoch seconds
+
+    def __post_init__(self) -> None:
+        self.reserved_until_ts = self.reserved_until.timestamp()
 
-    def is_expired(self) -> bool:
-        """Check if reservation has expired"""
-        return datetime.now(timezone.utc) > self.reserved_until
+    def is_expired(self, now_ts: float | None = None) -> bool:
+        """Check if reservation has expired (pass now_ts to share one clock read)"""
+        return (time.time() if now_ts is None else now_ts) > self.reserved_until_ts
 
 
 class ProductAggregate:
@@ -44,6 +53,10 @@ class ProductAggregate:
         self.description: str = ""
         self.total_stock: int = 0
         self.reservations: dict[UUID, StockReservation] = {}  # cart_id -> reservation
+        self._reserved_total: int = 0  # sum of reservation quantities, kept by _apply_*
+        # (reserved_until_ts, cart_id) min-heap; entries go stale when a reservation
+        # is released or replaced and are skipped lazily on pop
+        self._expiry_heap: list[tuple[float, UUID]] = []
         self.version: int = 0
         self.created_at: datetime | None = datetime.now(timezone.utc)
         self.uncommitted_events: list[DomainEvent] = []
@@ -56,13 +69,13 @@ class ProductAggregate:
         is_new=True: new event (add to uncommitted)
         is_new=False: replay from event store (don't add to uncommitted)
         """
-        handler_name = f"_apply_{event.event_type}"
-        handler = getattr(self, handler_name, None)
+        # Route to specific handler (dispatch table built once per class)
+        handler = self._HANDLERS.get(event.event_type)
         
         if handler is None:
             raise ValueError(f"No handler for event type: {event.event_type}")
         
-        handler(event)
+        handler(self, event)
         
         if is_new:
             self.uncommitted_events.append(event)
@@ -76,15 +89,21 @@ class ProductAggregate:
         self.version = event.aggregate_version
 
     def _apply_ProductStockReserved(self, event: ProductStockReserved) -> None:
-        self.reservations[event.cart_id] = StockReservation(
-            cart_id=event.cart_id,
-            quantity=event.quantity,
-            reserved_until=event.reserved_until
+        previous = self.reservations.get(event.cart_id)
+        if previous is not None:
+            self._reserved_total -= previous.quantity
+        self._reserved_total += event.quantity
+        reservation = StockReservation(
+            cart_id=event.cart_id, quantity=event.quantity, reserved_until=event.reserved_until
         )
+        self.reservations[event.cart_id] = reservation
+        heapq.heappush(self._expiry_heap, (reservation.reserved_until_ts, event.cart_id))
         self.version = event.aggregate_version
 
     def _apply_ProductStockReservationReleased(self, event: ProductStockReservationReleased) -> None:
-        self.reservations.pop(event.cart_id, None)
+        released = self.reservations.pop(event.cart_id, None)
+        if released is not None:
+            self._reserved_total -= released.quantity
         self.version = event.aggregate_version
 
     def _apply_ProductStockIncreased(self, event: ProductStockIncreased) -> None:
@@ -95,6 +114,13 @@ class ProductAggregate:
         self.total_stock -= event.quantity
         self.version = event.aggregate_version
 
+    def _apply_ProductStockSold(self, event: ProductStockSold) -> None:
+        sold = self.reservations.pop(event.cart_id, None)
+        if sold is not None:
+            self._reserved_total -= sold.quantity
+        self.total_stock -= event.quantity
+        self.version = event.aggregate_version
+
     def _apply_ProductPriceChanged(self, event: ProductPriceChanged) -> None:
         self.price = event.new_price
         self.version = event.aggregate_version
@@ -106,6 +132,18 @@ class ProductAggregate:
             self.description = event.description
         self.version = event.aggregate_version
 
+    # event_type -> handler, used by apply_event instead of getattr per event
+    _HANDLERS: ClassVar[dict[str, Callable[[Any, DomainEvent], None]]] = {
+        "ProductCreated": _apply_ProductCreated,
+        "ProductStockReserved": _apply_ProductStockReserved,
+        "ProductStockReservationReleased": _apply_ProductStockReservationReleased,
+        "ProductStockIncreased": _apply_ProductStockIncreased,
+        "ProductStockDecreased": _apply_ProductStockDecreased,
+        "ProductStockSold": _apply_ProductStockSold,
+        "ProductPriceChanged": _apply_ProductPriceChanged,
+        "ProductUpdated": _apply_ProductUpdated,
+    }
+
     # === Business Logic (Commands) ===
 
     def create(self, name: str, price: float, initial_stock: int, description: str = "") -> None:
@@ -120,13 +158,13 @@ class ProductAggregate:
             raise ValueError("Stock cannot be negative")
 
         event = ProductCreated(
-            event_id=uuid4(),
+            event_id=next_event_id(),
             aggregate_id=self.product_id,
             aggregate_version=self.version + 1,
             name=name,
             price=price,
             initial_stock=initial_stock,
-            description=description
+            description=description,
         )
         self.apply_event(event)
 
@@ -164,12 +202,12 @@ class ProductAggregate:
         reserved_until = datetime.now(timezone.utc) + timedelta(minutes=reservation_minutes)
         
         event = ProductStockReserved(
-            event_id=uuid4(),
+            event_id=next_event_id(),
             aggregate_id=self.product_id,
             aggregate_version=self.version + 1,
             cart_id=cart_id,
             quantity=quantity,
-            reserved_until=reserved_until
+            reserved_until=reserved_until,
         )
         self.apply_event(event)
 
@@ -181,12 +219,12 @@ class ProductAggregate:
             return
 
         event = ProductStockReservationReleased(
-            event_id=uuid4(),
+            event_id=next_event_id(),
             aggregate_id=self.product_id,
             aggregate_version=self.version + 1,
             cart_id=cart_id,
             quantity=reservation.quantity,
-            reason=reason
+            reason=reason,
         )
         self.apply_event(event)
 
@@ -200,16 +238,14 @@ class ProductAggregate:
         if reservation is None:
             raise ValueError(f"No reservation found for cart {cart_id}")
 
-        # Release reservation
-        self.release_reservation(cart_id, reason="checkout")
-
-        # Decrease total stock (actually sold)
-        event = ProductStockDecreased(
-            event_id=uuid4(),
+        # Release reservation and decrease total stock in one event
+        event = ProductStockSold(
+            event_id=next_event_id(),
             aggregate_id=self.product_id,
             aggregate_version=self.version + 1,
+            cart_id=cart_id,
             quantity=reservation.quantity,
-            order_id=order_id
+            order_id=order_id,
         )
         self.apply_event(event)
 
@@ -219,10 +255,10 @@ class ProductAggregate:
             raise ValueError("Quantity must be positive")
 
         event = ProductStockIncreased(
-            event_id=uuid4(),
+            event_id=next_event_id(),
             aggregate_id=self.product_id,
             aggregate_version=self.version + 1,
-            quantity=quantity
+            quantity=quantity,
         )
         self.apply_event(event)
 
@@ -235,11 +271,11 @@ class ProductAggregate:
             return
 
         event = ProductPriceChanged(
-            event_id=uuid4(),
+            event_id=next_event_id(),
             aggregate_id=self.product_id,
             aggregate_version=self.version + 1,
             old_price=self.price,
-            new_price=new_price
+            new_price=new_price,
         )
         self.apply_event(event)
 
@@ -249,11 +285,11 @@ class ProductAggregate:
             return
 
         event = ProductUpdated(
-            event_id=uuid4(),
+            event_id=next_event_id(),
             aggregate_id=self.product_id,
             aggregate_version=self.version + 1,
             name=name,
-            description=description
+            description=description,
         )
         self.apply_event(event)
 
@@ -263,7 +299,7 @@ class ProductAggregate:
     def reserved_stock(self) -> int:
         """Calculate total reserved stock (excluding expired)"""
         self._release_expired_reservations()
-        return sum(r.quantity for r in self.reservations.values())
+        return self._reserved_total
 
     @property
     def available_stock(self) -> int:
@@ -272,14 +308,59 @@ class ProductAggregate:
 
     def _release_expired_reservations(self) -> None:
         """Internal: Release all expired reservations"""
-        expired_carts = [
-            cart_id for cart_id, reservation in self.reservations.items()
-            if reservation.is_expired()
-        ]
-        
-        for cart_id in expired_carts:
+        heap = self._expiry_heap
+        if not heap:
+            return
+
+        now_ts = time.time()
+        while heap and heap[0][0] < now_ts:
+            reserved_until_ts, cart_id = heapq.heappop(heap)
+            reservation = self.reservations.get(cart_id)
+            # Skip stale entries - reservation already gone or renewed
+            if reservation is None or reservation.reserved_until_ts != reserved_until_ts:
+                continue
             self.release_reservation(cart_id, reason="timeout")
 
+    # === Snapshots ===
+
+    def to_snapshot(self) -> dict[str, Any]:
+        """JSON-serializable state, stored every few events to bound replay"""
+        return {
+            "name": self.name,
+            "price": self.price,
+            "description": self.description,
+            "total_stock": self.total_stock,
+            "reservations": [
+                [str(r.cart_id), r.quantity, r.reserved_until.isoformat()]
+                for r in self.reservations.values()
+            ],
+            "version": self.version,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+        }
+
+    @classmethod
+    def from_snapshot(cls, product_id: str, data: dict[str, Any]) -> "ProductAggregate":
+        """Restore aggregate from to_snapshot() output (events after it are replayed)"""
+        aggregate = cls(product_id)
+        aggregate.name = data["name"]
+        aggregate.price = data["price"]
+        aggregate.description = data["description"]
+        aggregate.total_stock = data["total_stock"]
+        for cart_id, quantity, reserved_until in data["reservations"]:
+            reservation = StockReservation(
+                cart_id=UUID(cart_id),
+                quantity=quantity,
+                reserved_until=datetime.fromisoformat(reserved_until),
+            )
+            aggregate.reservations[reservation.cart_id] = reservation
+            aggregate._reserved_total += quantity
+            aggregate._expiry_heap.append((reservation.reserved_until_ts, reservation.cart_id))
+        heapq.heapify(aggregate._expiry_heap)
+        aggregate.version = data["version"]
+        created_at = data["created_at"]
+        aggregate.created_at = datetime.fromisoformat(created_at) if created_at else None
+        return aggregate
+
     def get_reservation(self, cart_id: UUID) -> StockReservation | None:
         """Get reservation for specific cart"""
         return self.reservations.get(cart_id)
@@ -291,3 +372,9 @@ class ProductAggregate:
     def get_uncommitted_events(self) -> list[DomainEvent]:
         """Get events that need to be persisted"""
         return self.uncommitted_events.copy()
+
+    def pop_uncommitted_events(self) -> list[DomainEvent]:
+        """Take events that need to be persisted and clear them (no copy)"""
+        events = self.uncommitted_events
+        self.uncommitted_events = []
+        return events
@@ -1,7 +1,7 @@
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Literal
 from uuid import UUID
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class DomainEvent(BaseModel):
@@ -12,17 +12,20 @@ class DomainEvent(BaseModel):
     occurred_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     event_type: str
 
-    class Config:
-        frozen = True
+    model_config = ConfigDict(frozen=True, extra="forbid")
 
     def to_dict(self) -> dict[str, Any]:
         """Serialize event to dictionary for storage"""
         return self.model_dump(mode='json')
 
+    def to_json(self) -> str:
+        """Serialize event straight to a JSON string (no intermediate dict)"""
+        return self.model_dump_json()
+
 
 class ProductCreated(DomainEvent):
     """Event: Product was created in inventory"""
-    event_type: str = "ProductCreated"
+    event_type: Literal["ProductCreated"] = "ProductCreated"
     name: str
     price: float
     initial_stock: int
@@ -31,7 +34,7 @@ class ProductCreated(DomainEvent):
 
 class ProductStockReserved(DomainEvent):
     """Event: Stock was reserved for a cart"""
-    event_type: str = "ProductStockReserved"
+    event_type: Literal["ProductStockReserved"] = "ProductStockReserved"
     cart_id: UUID
     quantity: int
     reserved_until: datetime
@@ -39,7 +42,7 @@ class ProductStockReserved(DomainEvent):
 
 class ProductStockReservationReleased(DomainEvent):
     """Event: Stock reservation was released"""
-    event_type: str = "ProductStockReservationReleased"
+    event_type: Literal["ProductStockReservationReleased"] = "ProductStockReservationReleased"
     cart_id: UUID
     quantity: int
     reason: str  # "timeout", "checkout", "cart_expired", "item_removed"
@@ -47,26 +50,34 @@ class ProductStockReservationReleased(DomainEvent):
 
 class ProductStockIncreased(DomainEvent):
     """Event: Stock was increased (restock)"""
-    event_type: str = "ProductStockIncreased"
+    event_type: Literal["ProductStockIncreased"] = "ProductStockIncreased"
     quantity: int
 
 
 class ProductStockDecreased(DomainEvent):
     """Event: Stock was decreased (checkout completed)"""
-    event_type: str = "ProductStockDecreased"
+    event_type: Literal["ProductStockDecreased"] = "ProductStockDecreased"
+    quantity: int
+    order_id: UUID
+
+
+class ProductStockSold(DomainEvent):
+    """Event: Reserved stock was sold (checkout) - releases reservation and decreases stock"""
+    event_type: Literal["ProductStockSold"] = "ProductStockSold"
+    cart_id: UUID
     quantity: int
     order_id: UUID
 
 
 class ProductPriceChanged(DomainEvent):
     """Event: Product price was changed"""
-    event_type: str = "ProductPriceChanged"
+    event_type: Literal["ProductPriceChanged"] = "ProductPriceChanged"
     old_price: float
     new_price: float
 
 
 class ProductUpdated(DomainEvent):
     """Event: Product details were updated"""
-    event_type: str = "ProductUpdated"
+    event_type: Literal["ProductUpdated"] = "ProductUpdated"
     name: str | None = None
     description: str | None = None
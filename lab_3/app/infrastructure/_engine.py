@@ -0,0 +1,37 @@
+from typing import Any
+
+from pydantic_core import from_json
+
+
+def engine_options(
+    application_name: str,
+    pool_size: int,
+    max_overflow: int,
+    pool_timeout: float,
+    pool_recycle: int,
+) -> dict[str, Any]:
+    """
+    create_async_engine kwargs shared by the cart and products databases.
+
+    Pool sizes are per process - with several uvicorn workers size them as
+    ((cores * 2) + spindles) / workers (DB_POOL_SIZE / DB_MAX_OVERFLOW).
+    """
+    return {
+        # JSON columns decoded by pydantic-core's Rust parser instead of json.loads
+        "json_deserializer": from_json,
+        # Long-lived pooled connections keep asyncpg's prepared statement
+        # cache warm; recycle/pre_ping drop connections the server closed
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": pool_timeout,
+        "pool_recycle": pool_recycle,
+        "pool_pre_ping": True,
+        "connect_args": {
+            # SQLAlchemy's per-connection prepared statement LRU (and
+            # asyncpg's own) - room for every hot query with its variants
+            "prepared_statement_cache_size": 512,
+            "statement_cache_size": 512,
+            # Short OLTP queries never amortize JIT compilation
+            "server_settings": {"jit": "off", "application_name": application_name},
+        },
+    }
@@ -11,9 +11,13 @@ from sqlalchemy import (
     Text,
 )
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime, timezone
 
+from app.infrastructure._engine import engine_options
+
 
 metadata = MetaData()
 
@@ -59,12 +63,26 @@ cart_read_model = Table(
 class Database:
     """Database connection manager"""
 
-    def __init__(self, database_url: str):
+    def __init__(
+        self,
+        database_url: str,
+        echo: bool = False,
+        pool_size: int = 15,
+        max_overflow: int = 20,
+        pool_timeout: float = 30,
+        pool_recycle: int = 1800,
+    ):
+        # echo logs every statement synchronously - keep it for local debugging
         self.engine = create_async_engine(
             database_url,
-            echo=True,
-            pool_size=20,
-            max_overflow=0,
+            echo=echo,
+            **engine_options(
+                "cart-svc",
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pool_timeout=pool_timeout,
+                pool_recycle=pool_recycle,
+            ),
         )
         self.session_factory = async_sessionmaker(
             self.engine,
@@ -82,10 +100,18 @@ class Database:
         async with self.engine.begin() as conn:
             await conn.run_sync(metadata.drop_all)
 
-    async def get_session(self) -> AsyncSession: # type: ignore
-        """Get database session"""
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[AsyncSession]:
+        """
+        Database session for one unit of work: async with db.session() as session.
+        Repositories commit explicitly - an error rolls back, exit closes.
+        """
         async with self.session_factory() as session:
-            yield session # type: ignore
+            try:
+                yield session
+            except BaseException:
+                await session.rollback()
+                raise
 
     async def close(self) -> None:
         """Close database connection"""
@@ -10,9 +10,13 @@ from sqlalchemy import (
     Table,
 )
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime, timezone
 
+from app.infrastructure._engine import engine_options
+
 
 metadata_products = MetaData()
 
@@ -33,6 +37,31 @@ product_events = Table(
     Index("idx_product_occurred_at", "occurred_at"),
 )
 
+# Product Snapshots - latest state per aggregate, bounds replay on load
+product_snapshots = Table(
+    "product_snapshots",
+    metadata_products,
+    Column("aggregate_id", String(255), primary_key=True),
+    Column("version", Integer, nullable=False),
+    Column("state", JSON, nullable=False),
+    Column(
+        "created_at",
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+    ),
+)
+
+# Product Outbox - one row per saved event, written in the event transaction.
+# ProductProjectionWorker applies the projection and deletes the rows
+product_outbox = Table(
+    "product_outbox",
+    metadata_products,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("event_id", UUID, nullable=False),
+    Column("aggregate_id", String(255), nullable=False),
+)
+
 # Product Read Model
 product_read_model = Table(
     "product_read_model",
@@ -50,16 +79,38 @@ product_read_model = Table(
     Index("idx_product_available", "available_stock"),
 )
 
+# Catalog listing (available_only, ORDER BY name, LIMIT/OFFSET) walks this
+# partial index in order instead of filtering and sorting the whole table
+Index(
+    "idx_product_available_by_name",
+    product_read_model.c.name,
+    postgresql_where=product_read_model.c.available_stock > 0,
+)
+
 
 class ProductDatabase:
     """Database connection manager for products service"""
 
-    def __init__(self, database_url: str):
+    def __init__(
+        self,
+        database_url: str,
+        echo: bool = False,
+        pool_size: int = 15,
+        max_overflow: int = 20,
+        pool_timeout: float = 30,
+        pool_recycle: int = 1800,
+    ):
+        # echo logs every statement synchronously - keep it for local debugging
         self.engine = create_async_engine(
             database_url,
-            echo=True,
-            pool_size=20,
-            max_overflow=0,
+            echo=echo,
+            **engine_options(
+                "products-svc",
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pool_timeout=pool_timeout,
+                pool_recycle=pool_recycle,
+            ),
         )
         self.session_factory = async_sessionmaker(
             self.engine,
@@ -77,10 +128,18 @@ class ProductDatabase:
         async with self.engine.begin() as conn:
             await conn.run_sync(metadata_products.drop_all)
 
-    async def get_session(self) -> AsyncSession: # type: ignore
-        """Get database session"""
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[AsyncSession]:
+        """
+        Database session for one unit of work: async with db.session() as session.
+        Repositories commit explicitly - an error rolls back, exit closes.
+        """
         async with self.session_factory() as session:
-            yield session # type: ignore
+            try:
+                yield session
+            except BaseException:
+                await session.rollback()
+                raise
 
     async def close(self) -> None:
         """Close database connection"""
@@ -0,0 +1,44 @@
+from datetime import datetime
+from typing import Any, Callable
+from uuid import UUID
+
+from pydantic import BaseModel
+
+# event_type -> (model_construct, (field, parser) pairs)
+EventConstructors = dict[str, tuple[Callable[..., Any], tuple[tuple[str, Callable], ...]]]
+
+
+def _field_parsers(event_class: type[BaseModel]) -> dict[str, Callable[[str], Any]]:
+    """Fields that need converting back from JSON (UUID, datetime) for model_construct"""
+    parsers: dict[str, Callable[[str], Any]] = {}
+    for name, field in event_class.model_fields.items():
+        if field.annotation is UUID:
+            parsers[name] = UUID
+        elif field.annotation is datetime:
+            parsers[name] = datetime.fromisoformat
+    return parsers
+
+
+def event_constructors(event_type_map: dict[str, type[BaseModel]]) -> EventConstructors:
+    """Build each store's event_type -> constructor map once, at class creation"""
+    return {
+        event_type: (event_class.model_construct, tuple(_field_parsers(event_class).items()))
+        for event_type, event_class in event_type_map.items()
+    }
+
+
+def deserialize_event(ctors: EventConstructors, event_type: str, data: dict[str, Any]) -> Any:
+    """
+    Rebuild event from event_data without validation (validated on write).
+    Only UUID/datetime fields are converted before model_construct.
+    """
+    try:
+        construct, parsers = ctors[event_type]
+    except KeyError:
+        raise ValueError(f"Unknown event type: {event_type}") from None
+
+    for name, parse in parsers:
+        value = data.get(name)
+        if isinstance(value, str):
+            data[name] = parse(value)
+    return construct(**data)
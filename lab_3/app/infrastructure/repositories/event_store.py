@@ -1,5 +1,7 @@
+from typing import Any, AsyncIterator
 from uuid import UUID
-from sqlalchemy import select, insert
+
+from sqlalchemy import select, insert, cast, bindparam, String, JSON
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 
@@ -16,6 +18,22 @@ from app.domain.cart.events import (
     ProductReservationReleased,
 )
 from app.infrastructure.database import cart_events
+from app.infrastructure.repositories._events import deserialize_event, event_constructors
+
+
+# event_data jest już zserializowanym JSON-em (to_json), rzutowanym po stronie
+# bazy - bez json.dumps. Wszystkie eventy idą jednym executemany
+_INSERT_EVENT = insert(cart_events).values(
+    event_data=cast(bindparam("event_data", type_=String), JSON)
+)
+
+# Replay agregatu - zapytanie budowane raz, wykonywane z parametrem
+_SELECT_EVENTS = (
+    select(cart_events.c.event_type, cart_events.c.event_data)
+    .where(cart_events.c.aggregate_id == bindparam("aggregate_id"))
+    .order_by(cart_events.c.aggregate_version.asc())
+    .execution_options(yield_per=500)
+)
 
 
 class ConcurrencyException(Exception):
@@ -43,29 +61,34 @@ class EventStore:
         "ProductReserved": ProductReserved,
         "ProductReservationReleased": ProductReservationReleased,
     }
+    # event_type -> (model_construct, (field, parser) pairs), built once
+    _EVENT_CTORS = event_constructors(EVENT_TYPE_MAP)
 
     def __init__(self, session: AsyncSession):
         self.session = session
 
     async def save_events(
-        self, 
-        aggregate_id: UUID, 
-        events: list[DomainEvent], 
-        expected_version: int
+        self,
+        aggregate_id: UUID,
+        events: list[DomainEvent],
+        expected_version: int,
+        commit: bool = True,
     ) -> None:
         """
         Save events to event store with optimistic locking.
         
         Optimistic locking:
-        - Sprawdzamy czy ostatni event ma expected_version
-        - Jeśli ktoś zapisał między czasem, unique constraint na (aggregate_id, version) 
-          rzuci IntegrityError
+        - Eventy muszą zaczynać się od expected_version + 1
+        - Jeśli ktoś zapisał między czasem, unique constraint na (aggregate_id, version)
+          rzuci IntegrityError - bez dodatkowego SELECT-a wersji
         - To zapewnia że nie tracimy eventów przy concurrent writes
         
         Args:
             aggregate_id: ID agregatu
             events: Lista eventów do zapisania
             expected_version: Oczekiwana wersja agregatu (dla optimistic locking)
+            commit: Commit od razu. False - eventy zostaną zatwierdzone razem
+                z aktualizacją read modelu w jednej transakcji.
         
         Raises:
             ConcurrencyException: Jeśli wykryto równoczesną modyfikację
@@ -73,29 +96,47 @@ class EventStore:
         if not events:
             return
 
-        # Sprawdź aktualną wersję w bazie
-        current_version = await self._get_current_version(aggregate_id)
-        
-        if current_version != expected_version:
+        # Wersje eventów muszą kontynuować expected_version (konflikty z innymi
+        # zapisami wykrywa unique constraint przy INSERT)
+        if events[0].aggregate_version != expected_version + 1:
             raise ConcurrencyException(
                 f"Concurrency conflict: expected version {expected_version}, "
-                f"but current version is {current_version}"
+                f"but events start at version {events[0].aggregate_version}"
             )
 
-        # Zapisz wszystkie eventy w jednej transakcji
+        await self._insert_events(events, commit)
+
+    async def save_many(self, events: list[DomainEvent], commit: bool = True) -> None:
+        """
+        Zapisz eventy wielu agregatów jednym executemany (np. masowe wygaszanie).
+        Wersje eventów ustala wywołujący - konflikt wykrywa unique constraint.
+
+        Raises:
+            ConcurrencyException: Jeśli któryś agregat został w międzyczasie zmieniony
+        """
+        if not events:
+            return
+
+        await self._insert_events(events, commit)
+
+    async def _insert_events(self, events: list[DomainEvent], commit: bool) -> None:
+        """Zapisz wszystkie eventy w jednej transakcji"""
         try:
-            for event in events:
-                stmt = insert(cart_events).values(
-                    event_id=event.event_id,
-                    aggregate_id=event.aggregate_id,
-                    aggregate_version=event.aggregate_version,
-                    event_type=event.event_type,
-                    event_data=event.to_dict(),
-                    occurred_at=event.occurred_at,
-                )
-                await self.session.execute(stmt)
-            
-            await self.session.commit()
+            rows = [
+                {
+                    "event_id": event.event_id,
+                    "aggregate_id": event.aggregate_id,
+                    "aggregate_version": event.aggregate_version,
+                    "event_type": event.event_type,
+                    "event_data": event.to_json(),
+                    "occurred_at": event.occurred_at,
+                }
+                for event in events
+            ]
+            await self.session.execute(_INSERT_EVENT, rows)
+
+            if commit:
+                await self.session.commit()
         except IntegrityError as e:
             await self.session.rollback()
             # Unique constraint violation na (aggregate_id, version)
@@ -108,51 +149,30 @@ class EventStore:
         Get all events for aggregate, ordered by version.
         Używane do odtworzenia stanu agregatu (replay).
         """
-        stmt = (
-            select(cart_events)
-            .where(cart_events.c.aggregate_id == aggregate_id)
-            .order_by(cart_events.c.aggregate_version.asc())
-        )
-        result = await self.session.execute(stmt)
-        rows = result.fetchall()
-
-        events = []
-        for row in rows:
-            event_class = self.EVENT_TYPE_MAP.get(row.event_type)
-            if event_class is None:
-                raise ValueError(f"Unknown event type: {row.event_type}")
-            
-            event = event_class(**row.event_data)
-            events.append(event)
-
-        return events
+        return [event async for event in self._stream_events(aggregate_id)]
+
+    async def _stream_events(self, aggregate_id: UUID) -> AsyncIterator[DomainEvent]:
+        """Eventy po kolei z kursora serwerowego (yield_per) - bez fetchall()"""
+        result = await self.session.stream(_SELECT_EVENTS, {"aggregate_id": aggregate_id})
+        deserialize = self._deserialize
+        async for event_type, event_data in result:
+            yield deserialize(event_type, event_data)
+
+    def _deserialize(self, event_type: str, data: dict[str, Any]) -> DomainEvent:
+        """Odtwórz event z event_data bez walidacji (wspólny deserializer)"""
+        return deserialize_event(self._EVENT_CTORS, event_type, data)
 
     async def load_aggregate(self, aggregate_id: UUID) -> CartAggregate | None:
         """
         Load aggregate by replaying all events.
         To jest serce event sourcingu - odtwarzamy stan z historii eventów.
         """
-        events = await self.get_events(aggregate_id)
-        
-        if not events:
-            return None
-
         aggregate = CartAggregate(aggregate_id)
-        for event in events:
+        async for event in self._stream_events(aggregate_id):
             # is_new=False bo to replay, nie dodajemy do uncommitted_events
             aggregate.apply_event(event, is_new=False)
 
-        return aggregate
+        if aggregate.version == 0:
+            return None
 
-    async def _get_current_version(self, aggregate_id: UUID) -> int:
-        """Get current version of aggregate from event store"""
-        stmt = (
-            select(cart_events.c.aggregate_version)
-            .where(cart_events.c.aggregate_id == aggregate_id)
-            .order_by(cart_events.c.aggregate_version.desc())
-            .limit(1)
-        )
-        result = await self.session.execute(stmt)
-        row = result.fetchone()
-        
-        return row[0] if row else 0
+        return aggregate
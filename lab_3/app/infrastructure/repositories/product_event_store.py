@@ -1,6 +1,9 @@
-from sqlalchemy import select, insert
+from typing import Any, AsyncIterator
+
+from sqlalchemy import select, insert, delete, cast, bindparam, String, JSON
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from app.domain.product.aggregate import ProductAggregate
 from app.domain.product.events import (
@@ -10,10 +13,46 @@ from app.domain.product.events import (
     ProductStockReservationReleased,
     ProductStockIncreased,
     ProductStockDecreased,
+    ProductStockSold,
     ProductPriceChanged,
     ProductUpdated,
 )
-from app.infrastructure.database_products import product_events
+from app.infrastructure.database_products import product_events, product_outbox, product_snapshots
+from app.infrastructure.repositories._events import deserialize_event, event_constructors
+
+
+# event_data is pre-serialized JSON text (to_json) cast server-side - no
+# json.dumps. All events of one save go out as a single executemany
+_INSERT_EVENT = insert(product_events).values(
+    event_data=cast(bindparam("event_data", type_=String), JSON)
+)
+
+# Outbox rows go out in the same transaction as the events they point to
+_INSERT_OUTBOX = insert(product_outbox)
+
+# Pending outbox rows; SKIP LOCKED lets several workers drain it concurrently.
+# Processed rows are deleted, so the table only ever holds the backlog
+_CLAIM_OUTBOX = (
+    select(product_outbox.c.id, product_outbox.c.aggregate_id)
+    .order_by(product_outbox.c.id)
+    .limit(bindparam("limit"))
+    .with_for_update(skip_locked=True)
+)
+_DELETE_OUTBOX = delete(product_outbox).where(
+    product_outbox.c.id.in_(bindparam("ids", expanding=True))
+)
+
+# Load queries built once at import and executed with fresh parameters
+_SELECT_EVENTS = (
+    select(product_events.c.event_type, product_events.c.event_data)
+    .where(product_events.c.aggregate_id == bindparam("aggregate_id"))
+    .where(product_events.c.aggregate_version > bindparam("after_version"))
+    .order_by(product_events.c.aggregate_version.asc())
+    .execution_options(yield_per=500)
+)
+_SELECT_SNAPSHOT = select(product_snapshots.c.state).where(
+    product_snapshots.c.aggregate_id == bindparam("aggregate_id")
+)
 
 
 class ConcurrencyException(Exception):
@@ -34,18 +73,26 @@ class ProductEventStore:
         "ProductStockReservationReleased": ProductStockReservationReleased,
         "ProductStockIncreased": ProductStockIncreased,
         "ProductStockDecreased": ProductStockDecreased,
+        "ProductStockSold": ProductStockSold,
         "ProductPriceChanged": ProductPriceChanged,
         "ProductUpdated": ProductUpdated,
     }
+    # event_type -> (model_construct, (field, parser) pairs), built once
+    _EVENT_CTORS = event_constructors(EVENT_TYPE_MAP)
+
+    # Snapshot every N versions so load_aggregate replays at most N events
+    SNAPSHOT_INTERVAL = 100
 
     def __init__(self, session: AsyncSession):
         self.session = session
 
     async def save_events(
-        self, 
-        aggregate_id: str, 
-        events: list[DomainEvent], 
-        expected_version: int
+        self,
+        aggregate_id: str,
+        events: list[DomainEvent],
+        expected_version: int,
+        commit: bool = True,
+        outbox: bool = True,
     ) -> None:
         """
         Save events to event store with optimistic locking.
@@ -54,6 +101,12 @@ class ProductEventStore:
             aggregate_id: Product ID
             events: List of events to save
             expected_version: Expected version for optimistic locking
+            commit: Commit immediately. Pass False to commit together with
+                the snapshot / read model update in one transaction.
+            outbox: Queue a product_outbox row per event in the same
+                transaction, so ProductProjectionWorker projects the read
+                model after the command returns. Pass False when the caller
+                updates the projection itself in that transaction.
         
         Raises:
             ConcurrencyException: If concurrent modification detected
@@ -61,82 +114,135 @@ class ProductEventStore:
         if not events:
             return
 
-        # Check current version
-        current_version = await self._get_current_version(aggregate_id)
-        
-        if current_version != expected_version:
+        # Events must continue from expected_version; conflicting writers are
+        # caught by the unique (aggregate_id, aggregate_version) index on INSERT
+        if events[0].aggregate_version != expected_version + 1:
             raise ConcurrencyException(
                 f"Concurrency conflict: expected version {expected_version}, "
-                f"but current version is {current_version}"
+                f"but events start at version {events[0].aggregate_version}"
             )
 
-        # Save all events in one transaction
+        await self._insert_events(events, commit, outbox)
+
+    async def save_new_aggregates(self, events: list[DomainEvent], commit: bool = True) -> None:
+        """
+        Save the creation events of several new aggregates in one executemany
+        (seeding). Any existing stream is reported by the unique index.
+        No outbox rows - the caller creates the projections in the same
+        transaction.
+
+        Raises:
+            ConcurrencyException: If one of the aggregates already exists
+        """
+        if not events:
+            return
+
+        await self._insert_events(events, commit, outbox=False)
+
+    async def _insert_events(self, events: list[DomainEvent], commit: bool, outbox: bool) -> None:
+        """Insert events (and optionally their outbox rows) in the session's transaction"""
         try:
-            for event in events:
-                occured_at = event.occurred_at
-                # if not occured_at.tzinfo:
-                #     occured_at = occured_at.replace(tzinfo=None)
-
-                stmt = insert(product_events).values(
-                    event_id=event.event_id,
-                    aggregate_id=event.aggregate_id,
-                    aggregate_version=event.aggregate_version,
-                    event_type=event.event_type,
-                    event_data=event.to_dict(),
-                    occurred_at=occured_at,
-                )
-                await self.session.execute(stmt)
-            
-            await self.session.commit()
+            rows = [
+                {
+                    "event_id": event.event_id,
+                    "aggregate_id": event.aggregate_id,
+                    "aggregate_version": event.aggregate_version,
+                    "event_type": event.event_type,
+                    "event_data": event.to_json(),
+                    "occurred_at": event.occurred_at,
+                }
+                for event in events
+            ]
+            await self.session.execute(_INSERT_EVENT, rows)
+            if outbox:
+                await self.session.execute(_INSERT_OUTBOX, self._outbox_rows(events))
+
+            if commit:
+                await self.session.commit()
         except IntegrityError as e:
             await self.session.rollback()
             raise ConcurrencyException(
                 f"Concurrency conflict detected when saving events: {str(e)}"
             ) from e
 
-    async def get_events(self, aggregate_id: str) -> list[DomainEvent]:
-        """Get all events for aggregate, ordered by version"""
-        stmt = (
-            select(product_events)
-            .where(product_events.c.aggregate_id == aggregate_id)
-            .order_by(product_events.c.aggregate_version.asc())
-        )
-        result = await self.session.execute(stmt)
-        rows = result.fetchall()
+    @staticmethod
+    def _outbox_rows(events: list[DomainEvent]) -> list[dict[str, Any]]:
+        return [
+            {"event_id": event.event_id, "aggregate_id": event.aggregate_id} for event in events
+        ]
 
-        events = []
-        for row in rows:
-            event_class = self.EVENT_TYPE_MAP.get(row.event_type)
-            if event_class is None:
-                raise ValueError(f"Unknown event type: {row.event_type}")
-            
-            event = event_class(**row.event_data)
-            events.append(event)
+    async def claim_outbox(self, limit: int) -> list[tuple[int, str]]:
+        """
+        Lock up to limit pending outbox rows as (id, aggregate_id).
+        Locks are held until the caller commits (after delete_outbox).
+        """
+        result = await self.session.execute(_CLAIM_OUTBOX, {"limit": limit})
+        return [tuple(row) for row in result]
+
+    async def delete_outbox(self, ids: list[int]) -> None:
+        """Delete claimed (projected) rows. Not committed here"""
+        await self.session.execute(_DELETE_OUTBOX, {"ids": ids})
+
+    async def get_events(self, aggregate_id: str, after_version: int = 0) -> list[DomainEvent]:
+        """Get events for aggregate newer than after_version, ordered by version"""
+        return [event async for event in self._stream_events(aggregate_id, after_version)]
+
+    async def _stream_events(
+        self, aggregate_id: str, after_version: int = 0
+    ) -> AsyncIterator[DomainEvent]:
+        """Events in order from a server-side cursor (yield_per) - no fetchall()"""
+        result = await self.session.stream(
+            _SELECT_EVENTS, {"aggregate_id": aggregate_id, "after_version": after_version}
+        )
+        deserialize = self._deserialize
+        async for event_type, event_data in result:
+            yield deserialize(event_type, event_data)
 
-        return events
+    def _deserialize(self, event_type: str, data: dict[str, Any]) -> DomainEvent:
+        """Rebuild event from event_data without validation (shared deserializer)"""
+        return deserialize_event(self._EVENT_CTORS, event_type, data)
 
     async def load_aggregate(self, aggregate_id: str) -> ProductAggregate | None:
-        """Load aggregate by replaying all events"""
-        events = await self.get_events(aggregate_id)
-        
-        if not events:
-            return None
+        """Load aggregate from the latest snapshot plus the events after it"""
+        result = await self.session.execute(_SELECT_SNAPSHOT, {"aggregate_id": aggregate_id})
+        state = result.scalar_one_or_none()
+
+        if state is not None:
+            aggregate = ProductAggregate.from_snapshot(aggregate_id, state)
+        else:
+            aggregate = ProductAggregate(aggregate_id)
 
-        aggregate = ProductAggregate(aggregate_id)
-        for event in events:
+        async for event in self._stream_events(aggregate_id, after_version=aggregate.version):
             aggregate.apply_event(event, is_new=False)
 
+        if aggregate.version == 0:
+            return None
+
         return aggregate
 
-    async def _get_current_version(self, aggregate_id: str) -> int:
-        """Get current version of aggregate from event store"""
-        stmt = (
-            select(product_events.c.aggregate_version)
-            .where(product_events.c.aggregate_id == aggregate_id)
-            .order_by(product_events.c.aggregate_version.desc())
-            .limit(1)
+    async def save_snapshot_if_due(
+        self, aggregate: ProductAggregate, previous_version: int
+    ) -> None:
+        """
+        Upsert aggregate snapshot when saving moved it past a SNAPSHOT_INTERVAL
+        boundary. Not committed here - goes out with the caller's transaction.
+        """
+        interval = self.SNAPSHOT_INTERVAL
+        if aggregate.version // interval == previous_version // interval:
+            return
+
+        stmt = pg_insert(product_snapshots).values(
+            aggregate_id=aggregate.product_id,
+            version=aggregate.version,
+            state=aggregate.to_snapshot(),
         )
-        result = await self.session.execute(stmt)
-        row = result.fetchone()
-        
-        return row[0] if row else 0
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[product_snapshots.c.aggregate_id],
+            set_={
+                "version": stmt.excluded.version,
+                "state": stmt.excluded.state,
+                "created_at": stmt.excluded.created_at,
+            },
+            where=product_snapshots.c.version < stmt.excluded.version,
+        )
+        await self.session.execute(stmt)
@@ -1,36 +1,34 @@
 from datetime import datetime, timezone
-from sqlalchemy import select, insert, update
+from typing import NamedTuple
+
+from sqlalchemy import select, insert, bindparam
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.infrastructure.database_products import product_read_model
 
 
-class ProductReadModel:
-    """DTO for product read model"""
-    
-    def __init__(
-        self,
-        product_id: str,
-        name: str,
-        price: float,
-        description: str,
-        total_stock: int,
-        reserved_stock: int,
-        available_stock: int,
-        version: int,
-        created_at: datetime,
-        updated_at: datetime,
-    ):
-        self.product_id = product_id
-        self.name = name
-        self.price = price
-        self.description = description
-        self.total_stock = total_stock
-        self.reserved_stock = reserved_stock
-        self.available_stock = available_stock
-        self.version = version
-        self.created_at = created_at
-        self.updated_at = updated_at
+class ProductReadModel(NamedTuple):
+    """DTO for product read model (built from a row tuple via _make)"""
+    product_id: str
+    name: str
+    price: float
+    description: str
+    total_stock: int
+    reserved_stock: int
+    available_stock: int
+    version: int
+    created_at: datetime
+    updated_at: datetime
+
+
+# Selected in ProductReadModel field order, so rows map straight onto _make
+_PRODUCT_COLUMNS = tuple(product_read_model.c[name] for name in ProductReadModel._fields)
+
+# Point lookup built once at import and executed with fresh parameters
+_SELECT_PRODUCT = select(*_PRODUCT_COLUMNS).where(
+    product_read_model.c.product_id == bindparam("product_id")
+)
 
 
 class ProductReadModelRepository:
@@ -45,25 +43,19 @@ class ProductReadModelRepository:
 
     async def get_product(self, product_id: str) -> ProductReadModel | None:
         """Get product from read model"""
-        stmt = select(product_read_model).where(product_read_model.c.product_id == product_id)
-        result = await self.session.execute(stmt)
+        result = await self.session.execute(_SELECT_PRODUCT, {"product_id": product_id})
         row = result.fetchone()
 
         if row is None:
             return None
 
-        return ProductReadModel(
-            product_id=row.product_id,
-            name=row.name,
-            price=row.price,
-            description=row.description,
-            total_stock=row.total_stock,
-            reserved_stock=row.reserved_stock,
-            available_stock=row.available_stock,
-            version=row.version,
-            created_at=row.created_at,
-            updated_at=row.updated_at,
-        )
+        return ProductReadModel._make(row)
+
+    async def has_products(self) -> bool:
+        """Check if any product exists (single key column, one row)"""
+        stmt = select(product_read_model.c.product_id).limit(1)
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none() is not None
 
     async def list_products(
         self, 
@@ -72,7 +64,7 @@ class ProductReadModelRepository:
         offset: int = 0
     ) -> list[ProductReadModel]:
         """List all products with optional filtering"""
-        stmt = select(product_read_model)
+        stmt = select(*_PRODUCT_COLUMNS)
         
         if available_only:
             stmt = stmt.where(product_read_model.c.available_stock > 0)
@@ -80,23 +72,7 @@ class ProductReadModelRepository:
         stmt = stmt.order_by(product_read_model.c.name).limit(limit).offset(offset)
 
         result = await self.session.execute(stmt)
-        rows = result.fetchall()
-
-        return [
-            ProductReadModel(
-                product_id=row.product_id,
-                name=row.name,
-                price=row.price,
-                description=row.description,
-                total_stock=row.total_stock,
-                reserved_stock=row.reserved_stock,
-                available_stock=row.available_stock,
-                version=row.version,
-                created_at=row.created_at,
-                updated_at=row.updated_at,
-            )
-            for row in rows
-        ]
+        return [ProductReadModel._make(row) for row in result]
 
     async def create_projection(
         self,
@@ -106,6 +82,7 @@ class ProductReadModelRepository:
         description: str,
         total_stock: int,
         created_at: datetime,
+        commit: bool = True,
     ) -> None:
         """Create initial projection when product is created"""
         stmt = insert(product_read_model).values(
@@ -121,7 +98,32 @@ class ProductReadModelRepository:
             updated_at=created_at,
         )
         await self.session.execute(stmt)
-        await self.session.commit()
+
+        if commit:
+            await self.session.commit()
+
+    async def create_projections(self, products: list[dict], commit: bool = True) -> None:
+        """
+        Create initial projections for several new products in one executemany.
+        Each dict has the create_projection arguments.
+        """
+        if not products:
+            return
+
+        rows = [
+            {
+                **product,
+                "reserved_stock": 0,
+                "available_stock": product["total_stock"],
+                "version": 1,
+                "updated_at": product["created_at"],
+            }
+            for product in products
+        ]
+        await self.session.execute(insert(product_read_model), rows)
+
+        if commit:
+            await self.session.commit()
 
     async def update_projection(
         self,
@@ -133,21 +135,33 @@ class ProductReadModelRepository:
         reserved_stock: int,
         available_stock: int,
         version: int,
+        commit: bool = True,
     ) -> None:
-        """Update projection after events are applied"""
-        stmt = (
-            update(product_read_model)
-            .where(product_read_model.c.product_id == product_id)
-            .values(
-                name=name,
-                price=price,
-                description=description,
-                total_stock=total_stock,
-                reserved_stock=reserved_stock,
-                available_stock=available_stock,
-                version=version,
-                updated_at=datetime.now(timezone.utc),
-            )
+        """
+        Upsert projection after events are applied.
+
+        Single INSERT ... ON CONFLICT round trip. The version guard keeps the
+        projection monotonic when retried commands finish out of order, and
+        makes replaying an already projected outbox row a no-op.
+        """
+        now = datetime.now(timezone.utc)
+        fields = dict(
+            name=name,
+            price=price,
+            description=description,
+            total_stock=total_stock,
+            reserved_stock=reserved_stock,
+            available_stock=available_stock,
+            version=version,
+            updated_at=now,
+        )
+        stmt = pg_insert(product_read_model).values(product_id=product_id, created_at=now, **fields)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[product_read_model.c.product_id],
+            set_={col: stmt.excluded[col] for col in fields},
+            where=product_read_model.c.version < stmt.excluded.version,
         )
         await self.session.execute(stmt)
-        await self.session.commit()
+
+        if commit:
+            await self.session.commit()
@@ -1,35 +1,66 @@
 from uuid import UUID
-from datetime import datetime
-from sqlalchemy import select, insert, update, delete
+from datetime import datetime, timedelta, timezone
+from typing import NamedTuple
+from sqlalchemy import select, insert, update, delete, values, column, bindparam, func, Integer
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 
 from app.infrastructure.database import cart_read_model
 
 
-class CartReadModel:
-    """DTO for cart read model"""
-    
-    def __init__(
-        self,
-        cart_id: UUID,
-        user_id: str,
-        status: str,
-        items: list[dict],
-        total_amount: float,
-        item_count: int,
-        version: int,
-        created_at: datetime,
-        last_activity: datetime,
-    ):
-        self.cart_id = cart_id
-        self.user_id = user_id
-        self.status = status
-        self.items = items
-        self.total_amount = total_amount
-        self.item_count = item_count
-        self.version = version
-        self.created_at = created_at
-        self.last_activity = last_activity
+# Projection UPDATE built once at import. Items live in a single JSON column,
+# so the SQL shape doesn't depend on cart size - every call reuses this
+# statement (and SQLAlchemy's compiled cache entry) with fresh parameters.
+_UPDATE_PROJECTION = (
+    update(cart_read_model)
+    .where(cart_read_model.c.cart_id == bindparam("p_cart_id"))
+    .values(
+        status=bindparam("p_status"),
+        items=bindparam("p_items"),
+        total_amount=bindparam("p_total_amount"),
+        item_count=bindparam("p_item_count"),
+        version=bindparam("p_version"),
+        last_activity=bindparam("p_last_activity"),
+        updated_at=bindparam("p_updated_at"),
+    )
+)
+
+class CartReadModel(NamedTuple):
+    """DTO for cart read model (built from a row tuple via _make)"""
+    cart_id: UUID
+    user_id: str
+    status: str
+    items: list[dict]
+    total_amount: float
+    item_count: int
+    version: int
+    created_at: datetime
+    last_activity: datetime
+
+
+class CartSummary(NamedTuple):
+    """DTO for cart list views - read model header without the items JSON"""
+    cart_id: UUID
+    user_id: str
+    status: str
+    total_amount: float
+    item_count: int
+    version: int
+    last_activity: datetime
+
+
+# Selected in DTO field order, so rows map straight onto _make
+_CART_COLUMNS = tuple(cart_read_model.c[name] for name in CartReadModel._fields)
+_SUMMARY_COLUMNS = tuple(cart_read_model.c[name] for name in CartSummary._fields)
+
+# Point lookups, built once like _UPDATE_PROJECTION
+_SELECT_CART = select(*_CART_COLUMNS).where(cart_read_model.c.cart_id == bindparam("cart_id"))
+_SELECT_STATUS = select(cart_read_model.c.status).where(
+    cart_read_model.c.cart_id == bindparam("cart_id")
+)
+
+# Advisory lock key held by the process currently expiring carts
+_EXPIRATION_LOCK_KEY = 0x63617274  # "cart"
 
 
 class ReadModelRepository:
@@ -45,24 +76,28 @@ class ReadModelRepository:
 
     async def get_cart(self, cart_id: UUID) -> CartReadModel | None:
         """Get cart from read model"""
-        stmt = select(cart_read_model).where(cart_read_model.c.cart_id == cart_id)
-        result = await self.session.execute(stmt)
+        result = await self.session.execute(_SELECT_CART, {"cart_id": cart_id})
         row = result.fetchone()
 
         if row is None:
             return None
 
-        return CartReadModel(
-            cart_id=row.cart_id,
-            user_id=row.user_id,
-            status=row.status,
-            items=row.items,
-            total_amount=row.total_amount,
-            item_count=row.item_count,
-            version=row.version,
-            created_at=row.created_at,
-            last_activity=row.last_activity,
+        return CartReadModel._make(row)
+
+    async def try_lock_expiration(self) -> bool:
+        """
+        Try to take the cart expiration advisory lock for the current
+        transaction - False if another process holds it
+        """
+        result = await self.session.execute(
+            select(func.pg_try_advisory_xact_lock(_EXPIRATION_LOCK_KEY))
         )
+        return bool(result.scalar_one())
+
+    async def is_pending(self, cart_id: UUID) -> bool:
+        """Check cart status in read model without loading the whole row"""
+        result = await self.session.execute(_SELECT_STATUS, {"cart_id": cart_id})
+        return result.scalar_one_or_none() == "PENDING"
 
     async def get_user_carts(
         self, 
@@ -70,7 +105,7 @@ class ReadModelRepository:
         status: str | None = None
     ) -> list[CartReadModel]:
         """Get all carts for user, optionally filtered by status"""
-        stmt = select(cart_read_model).where(cart_read_model.c.user_id == user_id)
+        stmt = select(*_CART_COLUMNS).where(cart_read_model.c.user_id == user_id)
         
         if status:
             stmt = stmt.where(cart_read_model.c.status == status)
@@ -78,22 +113,21 @@ class ReadModelRepository:
         stmt = stmt.order_by(cart_read_model.c.last_activity.desc())
 
         result = await self.session.execute(stmt)
-        rows = result.fetchall()
+        return [CartReadModel._make(row) for row in result]
 
-        return [
-            CartReadModel(
-                cart_id=row.cart_id,
-                user_id=row.user_id,
-                status=row.status,
-                items=row.items,
-                total_amount=row.total_amount,
-                item_count=row.item_count,
-                version=row.version,
-                created_at=row.created_at,
-                last_activity=row.last_activity,
-            )
-            for row in rows
-        ]
+    async def get_user_cart_summaries(
+        self, user_id: str, status: str | None = None
+    ) -> list[CartSummary]:
+        """Like get_user_carts, but skips the items column (list views)"""
+        stmt = select(*_SUMMARY_COLUMNS).where(cart_read_model.c.user_id == user_id)
+
+        if status:
+            stmt = stmt.where(cart_read_model.c.status == status)
+
+        stmt = stmt.order_by(cart_read_model.c.last_activity.desc())
+
+        result = await self.session.execute(stmt)
+        return [CartSummary._make(row) for row in result]
 
     async def create_projection(
         self,
@@ -127,17 +161,49 @@ class ReadModelRepository:
         last_activity: datetime,
     ) -> None:
         """Update projection after events are applied"""
+        await self.session.execute(
+            _UPDATE_PROJECTION,
+            {
+                "p_cart_id": cart_id,
+                "p_status": status,
+                "p_items": items,
+                "p_total_amount": total_amount,
+                "p_item_count": item_count,
+                "p_version": version,
+                "p_last_activity": last_activity,
+                "p_updated_at": datetime.now(timezone.utc),
+            },
+        )
+        await self.session.commit()
+
+    async def bulk_mark_expired(
+        self,
+        version_map: dict[UUID, int],
+        expired_at: datetime,
+    ) -> None:
+        """
+        Mark many carts as EXPIRED with a single UPDATE ... FROM (VALUES ...).
+
+        Expiration doesn't touch items/totals, so only status, version
+        and activity timestamps need to change.
+        """
+        if not version_map:
+            return
+
+        v = values(
+            column("cart_id", PG_UUID),
+            column("version", Integer),
+            name="v",
+        ).data(list(version_map.items()))
+
         stmt = (
             update(cart_read_model)
-            .where(cart_read_model.c.cart_id == cart_id)
+            .where(cart_read_model.c.cart_id == v.c.cart_id)
             .values(
-                status=status,
-                items=items,
-                total_amount=total_amount,
-                item_count=item_count,
-                version=version,
-                last_activity=last_activity,
-                updated_at=datetime.utcnow(),
+                status="EXPIRED",
+                version=v.c.version,
+                last_activity=expired_at,
+                updated_at=datetime.now(timezone.utc),
             )
         )
         await self.session.execute(stmt)
@@ -149,11 +215,58 @@ class ReadModelRepository:
         await self.session.execute(stmt)
         await self.session.commit()
 
+    async def get_expired_cart_states(
+        self, timeout_minutes: int = 15
+    ) -> list[tuple[UUID, int, list[dict]]]:
+        """
+        Like get_expired_carts, but also returns version and items so the
+        background task can append CartExpired events without replaying
+        (projection is committed together with the events, so it is exact).
+
+        Returns:
+            (cart_id, version, items) of every cart to expire
+        """
+        timeout_threshold = datetime.now(timezone.utc) - timedelta(minutes=timeout_minutes)
+
+        stmt = (
+            select(
+                cart_read_model.c.cart_id,
+                cart_read_model.c.version,
+                cart_read_model.c.items,
+            )
+            .where(cart_read_model.c.status == "PENDING")
+            .where(cart_read_model.c.last_activity < timeout_threshold)
+        )
+        result = await self.session.execute(stmt)
+        return [tuple(row) for row in result]
+
+    async def get_expiring_activity(
+        self, timeout_minutes: int = 15, within_seconds: float = 0
+    ) -> list[tuple[UUID, datetime]]:
+        """
+        Get (cart_id, last_activity) of PENDING carts that expire within
+        within_seconds from now (already expired ones included)
+        """
+        activity_threshold = (
+            datetime.now(timezone.utc)
+            - timedelta(minutes=timeout_minutes)
+            + timedelta(seconds=within_seconds)
+        )
+
+        stmt = (
+            select(cart_read_model.c.cart_id, cart_read_model.c.last_activity)
+            .where(cart_read_model.c.status == "PENDING")
+            .where(cart_read_model.c.last_activity < activity_threshold)
+        )
+
+        result = await self.session.execute(stmt)
+        rows = result.fetchall()
+
+        return [(row.cart_id, row.last_activity) for row in rows]
+
     async def get_expired_carts(self, timeout_minutes: int = 15) -> list[UUID]:
         """Get cart IDs that should be expired due to inactivity"""
-        from datetime import timedelta
-        
-        timeout_threshold = datetime.utcnow() - timedelta(minutes=timeout_minutes)
+        timeout_threshold = datetime.now(timezone.utc) - timedelta(minutes=timeout_minutes)
         
         stmt = (
             select(cart_read_model.c.cart_id)
@@ -162,6 +275,4 @@ class ReadModelRepository:
         )
         
         result = await self.session.execute(stmt)
-        rows = result.fetchall()
-        
-        return [row.cart_id for row in rows]
+        return list(result.scalars())
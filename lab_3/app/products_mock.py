@@ -1,6 +1,9 @@
-from fastapi import FastAPI, HTTPException
+import hashlib
+
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
+from pydantic_core import to_json
 
 app = FastAPI(title="Products Service (Mock)")
 
@@ -62,21 +65,45 @@ PRODUCTS = {
 }
 
 
+# Data is constant - serialize once at import, endpoints only send bytes
+PRODUCTS_JSON: dict[str, bytes] = {
+    product_id: product.model_dump_json().encode() for product_id, product in PRODUCTS.items()
+}
+ALL_PRODUCTS_JSON: bytes = to_json({"products": list(PRODUCTS.values())})
+
+
+def _etag(content: bytes) -> str:
+    return f'"{hashlib.blake2b(content, digest_size=8).hexdigest()}"'
+
+
+PRODUCTS_ETAG: dict[str, str] = {
+    product_id: _etag(content) for product_id, content in PRODUCTS_JSON.items()
+}
+ALL_PRODUCTS_ETAG = _etag(ALL_PRODUCTS_JSON)
+
+
+def _json_response(request: Request, content: bytes, etag: str) -> Response:
+    """Pre-serialized body, or an empty 304 when the client already has it"""
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=content, media_type="application/json", headers={"ETag": etag})
+
+
 @app.get("/products/{product_id}")
-async def get_product(product_id: str):
+async def get_product(product_id: str, request: Request):
     """Get product by ID"""
-    product = PRODUCTS.get(product_id)
+    content = PRODUCTS_JSON.get(product_id)
     
-    if product is None:
+    if content is None:
         raise HTTPException(status_code=404, detail=f"Product {product_id} not found")
     
-    return product.model_dump()
+    return _json_response(request, content, PRODUCTS_ETAG[product_id])
 
 
 @app.get("/products")
-async def list_products():
+async def list_products(request: Request):
     """List all products"""
-    return {"products": [p.model_dump() for p in PRODUCTS.values()]}
+    return _json_response(request, ALL_PRODUCTS_JSON, ALL_PRODUCTS_ETAG)
 
 
 @app.get("/health")
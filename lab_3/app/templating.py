@@ -0,0 +1,26 @@
+import os
+
+from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+# Dev only - re-stat template files on every render
+TEMPLATES_AUTO_RELOAD = os.getenv("TEMPLATES_AUTO_RELOAD", "0") == "1"
+
+
+def create_templates(directory: str = "app/templates") -> Jinja2Templates:
+    """
+    One shared Jinja environment per process.
+
+    Compiled templates are kept in Jinja's in-memory cache and as bytecode
+    on disk (temp dir), so new workers load code objects instead of
+    re-parsing. All templates are compiled here, before the first request.
+    """
+    env = Environment(
+        loader=FileSystemLoader(directory),
+        bytecode_cache=FileSystemBytecodeCache(),
+        auto_reload=TEMPLATES_AUTO_RELOAD,
+        autoescape=True,
+    )
+    for name in env.list_templates(extensions=["html"]):
+        env.get_template(name)
+    return Jinja2Templates(env=env)
@@ -0,0 +1,34 @@
+from app.infrastructure import cache
+from app.infrastructure.cache import TTLCache
+
+
+class TestTTLCache:
+    """
+    Unit testy dla TTLCache.
+    """
+
+    def test_get_returns_value_until_expired(self, monkeypatch):
+        """Test: wpis wygasa po ttl sekundach"""
+        now = [100.0]
+        monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+        store = TTLCache(maxsize=10, ttl=30)
+
+        store.set("P001", "laptop")
+        assert store.get("P001") == "laptop"
+
+        now[0] += 30
+        assert store.get("P001") is None
+
+    def test_invalidate_and_maxsize(self):
+        """Test: invalidate usuwa wpis, przy maxsize wypada najstarszy"""
+        store = TTLCache(maxsize=2, ttl=30)
+        store.set("P001", 1)
+        store.set("P002", 2)
+        store.set("P003", 3)
+
+        assert store.get("P001") is None
+        assert store.get("P003") == 3
+
+        store.invalidate("P003")
+        assert store.get("P003") is None
+        assert store.get("P002") == 2
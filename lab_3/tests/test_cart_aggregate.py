@@ -1,4 +1,5 @@
 import pytest
+from datetime import datetime, timedelta, timezone
 from uuid import uuid4
 
 from app.domain.cart.aggregate import CartAggregate
@@ -84,6 +85,51 @@ class TestCartAggregate:
         assert aggregate.items["P001"].quantity == 3
         assert aggregate.item_count == 3
 
+    def test_change_quantity_updates_totals(self):
+        """Test: zmiana ilości i usunięcie aktualizują liczbę produktów i sumę"""
+        aggregate = CartAggregate(uuid4())
+        aggregate.create(user_id="user_123")
+        aggregate.add_item("P001", "Laptop", 4999.99, 1)
+        aggregate.add_item("P002", "Mouse", 99.99, 2)
+        aggregate.change_quantity("P001", 4)
+
+        assert aggregate.items["P001"].quantity == 4
+        assert aggregate.item_count == 6
+        assert aggregate.total_amount == pytest.approx(4 * 4999.99 + 2 * 99.99)
+
+        aggregate.remove_item("P002")
+
+        assert aggregate.item_count == 4
+        assert aggregate.total_amount == pytest.approx(4 * 4999.99)
+
+    def test_add_same_item_keeps_original_price_in_total(self):
+        """Test: ponowne dodanie produktu liczy sumę wg ceny pozycji w koszyku"""
+        aggregate = CartAggregate(uuid4())
+        aggregate.create(user_id="user_123")
+        aggregate.add_item("P001", "Laptop", 10.0, 1)
+        aggregate.add_item("P001", "Laptop", 20.0, 1)
+
+        assert aggregate.items["P001"].price == 10.0
+        assert aggregate.total_amount == pytest.approx(20.0)
+        assert aggregate.total_amount == pytest.approx(
+            sum(item.total_price for item in aggregate.items.values())
+        )
+
+    def test_remove_all_items_resets_total(self):
+        """Test: po usunięciu wszystkich produktów suma wynosi dokładnie 0"""
+        aggregate = CartAggregate(uuid4())
+        aggregate.create(user_id="user_123")
+        aggregate.add_item("P001", "Laptop", 10.0, 1)
+        aggregate.add_item("P001", "Laptop", 20.0, 1)
+        aggregate.add_item("P002", "Mouse", 0.1, 1)
+        aggregate.add_item("P003", "Cable", 0.2, 1)
+        aggregate.remove_item("P001")
+        aggregate.remove_item("P002")
+        aggregate.remove_item("P003")
+
+        assert aggregate.item_count == 0
+        assert aggregate.total_amount == 0.0
+
     def test_cannot_add_item_with_negative_quantity(self):
         """Test: nie można dodać produktu z ujemną ilością"""
         cart_id = uuid4()
@@ -188,3 +234,48 @@ class TestCartAggregate:
         
         # Replay nie powinien dodawać do uncommitted_events
         assert len(aggregate2.get_uncommitted_events()) == 0
+
+    def test_pop_uncommitted_events(self):
+        """Test: pobranie eventów do zapisu czyści listę"""
+        aggregate = CartAggregate(uuid4())
+        aggregate.create(user_id="user_123")
+        aggregate.add_item("P001", "Laptop", 4999.99, 1)
+
+        events = aggregate.pop_uncommitted_events()
+
+        assert [type(e) for e in events] == [CartCreated, ItemAddedToCart]
+        assert aggregate.get_uncommitted_events() == []
+
+    def test_is_expired_after_inactivity(self):
+        """Test: koszyk wygasa po okresie bezczynności"""
+        cart_id = uuid4()
+        aggregate = CartAggregate(cart_id)
+        aggregate.apply_event(
+            CartCreated(
+                event_id=uuid4(),
+                aggregate_id=cart_id,
+                aggregate_version=1,
+                user_id="user_123",
+                occurred_at=datetime.now(timezone.utc) - timedelta(minutes=20),
+            ),
+            is_new=False,
+        )
+
+        assert aggregate.is_expired(timeout_minutes=15)
+        assert not aggregate.is_expired(timeout_minutes=30)
+
+    def test_expired_event_replays_like_expire(self):
+        """Test: CartExpired z masowego wygaszania daje ten sam stan co expire()"""
+        cart_id = uuid4()
+        aggregate = CartAggregate(cart_id)
+        aggregate.create(user_id="user_123")
+        aggregate.add_item("P001", "Laptop", 4999.99, 1)
+        aggregate.pop_uncommitted_events()
+
+        event = CartAggregate.expired_event(cart_id, aggregate.version + 1, "15_minute_timeout")
+        aggregate.apply_event(event, is_new=False)
+
+        assert aggregate.status == "EXPIRED"
+        assert aggregate.version == 3
+        with pytest.raises(ValueError):
+            aggregate.expire()
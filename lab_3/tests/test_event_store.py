@@ -0,0 +1,38 @@
+import json
+from uuid import uuid4
+
+from app.domain.cart.aggregate import CartAggregate
+from app.domain.product.aggregate import ProductAggregate
+from app.infrastructure.repositories.event_store import EventStore
+from app.infrastructure.repositories.product_event_store import ProductEventStore
+
+
+class TestEventDeserialization:
+    """
+    Unit testy odtwarzania eventów z event_data (bez bazy).
+    """
+
+    def test_cart_events_round_trip(self):
+        """Test: event po zapisie do JSON-a i odczycie jest identyczny"""
+        aggregate = CartAggregate(uuid4())
+        aggregate.create(user_id="user_123")
+        aggregate.add_item("P001", "Laptop", 4999.99, 2)
+        aggregate.checkout(order_id=uuid4())
+        store = EventStore(session=None)
+
+        for event in aggregate.pop_uncommitted_events():
+            restored = store._deserialize(event.event_type, json.loads(event.to_json()))
+            assert restored == event
+
+    def test_product_events_round_trip(self):
+        """Test: eventy produktu (UUID, datetime ze strefą) wracają z JSON-a"""
+        aggregate = ProductAggregate("P001")
+        aggregate.create("Laptop", 4999.99, 10, "")
+        cart_id = uuid4()
+        aggregate.reserve_stock(cart_id=cart_id, quantity=3)
+        aggregate.checkout_reservation(cart_id, order_id=uuid4())
+        store = ProductEventStore(session=None)
+
+        for event in aggregate.pop_uncommitted_events():
+            restored = store._deserialize(event.event_type, json.loads(event.to_json()))
+            assert restored == event
@@ -1,3 +1,4 @@
+import json
 import pytest
 from uuid import uuid4
 
@@ -25,3 +26,65 @@ class TestCartAggregate:
         
         with pytest.raises(ValueError, match="Insufficient stock"):
             aggregate.reserve_stock(cart_id=uuid4(), quantity=10)
+
+    # Test releasing reservation returns stock
+    def test_release_reservation(self):
+        aggregate = ProductAggregate("P001")
+        aggregate.create("Laptop", 4999.99, 10, "")
+        cart_id = uuid4()
+
+        aggregate.reserve_stock(cart_id=cart_id, quantity=3)
+        aggregate.reserve_stock(cart_id=uuid4(), quantity=2)
+        aggregate.release_reservation(cart_id)
+
+        assert aggregate.reserved_stock == 2
+        assert aggregate.available_stock == 8
+
+    # Test expired reservations are released, renewed ones are kept
+    def test_expired_reservation_released(self):
+        aggregate = ProductAggregate("P001")
+        aggregate.create("Laptop", 4999.99, 10, "")
+        expired_cart = uuid4()
+        renewed_cart = uuid4()
+
+        aggregate.reserve_stock(cart_id=expired_cart, quantity=3, reservation_minutes=-1)
+        aggregate.reserve_stock(cart_id=renewed_cart, quantity=1, reservation_minutes=-1)
+        aggregate.reserve_stock(cart_id=renewed_cart, quantity=2)
+
+        assert aggregate.reserved_stock == 2
+        assert aggregate.get_reservation(expired_cart) is None
+        assert aggregate.get_reservation(renewed_cart).quantity == 2
+
+    # Test snapshot round trip (JSON-serializable, restores reservations)
+    def test_snapshot_round_trip(self):
+        aggregate = ProductAggregate("P001")
+        aggregate.create("Laptop", 4999.99, 10, "13-inch")
+        cart_id = uuid4()
+        aggregate.reserve_stock(cart_id=cart_id, quantity=3)
+
+        snapshot = json.loads(json.dumps(aggregate.to_snapshot()))
+        restored = ProductAggregate.from_snapshot("P001", snapshot)
+
+        assert restored.version == aggregate.version
+        assert restored.name == "Laptop"
+        assert restored.reserved_stock == 3
+        assert restored.get_reservation(cart_id) == aggregate.get_reservation(cart_id)
+
+        restored.release_reservation(cart_id)
+        assert restored.available_stock == 10
+
+    # Test checkout emits a single sold event
+    def test_checkout_reservation(self):
+        aggregate = ProductAggregate("P001")
+        aggregate.create("Laptop", 4999.99, 10, "")
+        cart_id = uuid4()
+        aggregate.reserve_stock(cart_id=cart_id, quantity=3)
+        aggregate.pop_uncommitted_events()
+
+        aggregate.checkout_reservation(cart_id, order_id=uuid4())
+
+        events = aggregate.pop_uncommitted_events()
+        assert [e.event_type for e in events] == ["ProductStockSold"]
+        assert aggregate.total_stock == 7
+        assert aggregate.reserved_stock == 0
+        assert aggregate.get_reservation(cart_id) is None
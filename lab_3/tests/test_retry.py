@@ -0,0 +1,104 @@
+import pytest
+
+from app.application import _retry
+from app.application._retry import backoff_delay, retry_with_backoff
+
+
+class ConflictError(Exception):
+    pass
+
+
+class TestRetryWithBackoff:
+    """
+    Unit testy dla retry z exponential backoff.
+    """
+
+    @pytest.fixture(autouse=True)
+    def no_sleep(self, monkeypatch):
+        delays = []
+
+        async def fake_sleep(delay):
+            delays.append(delay)
+
+        monkeypatch.setattr(_retry.asyncio, "sleep", fake_sleep)
+        monkeypatch.setattr(_retry, "_BACKOFF_TABLE", _retry.defaultdict(lambda: _retry.INITIAL_MS))
+        return delays
+
+    async def test_retries_until_success(self, no_sleep):
+        calls = []
+
+        async def operation():
+            calls.append(1)
+            if len(calls) < 3:
+                raise ConflictError()
+            return "ok"
+
+        result = await retry_with_backoff(operation, 3, retry_on=ConflictError)
+
+        assert result == "ok"
+        assert len(calls) == 3
+        assert len(no_sleep) == 2
+
+    async def test_reraises_after_max_retries(self, no_sleep):
+        async def operation():
+            raise ConflictError()
+
+        with pytest.raises(ConflictError):
+            await retry_with_backoff(operation, 3, retry_on=ConflictError)
+
+        # Nie czekamy po ostatniej próbie
+        assert len(no_sleep) == 2
+
+    async def test_other_errors_are_not_retried(self, no_sleep):
+        calls = []
+
+        async def operation():
+            calls.append(1)
+            raise ValueError("permanent")
+
+        with pytest.raises(ValueError, match="permanent"):
+            await retry_with_backoff(operation, 3, retry_on=ConflictError)
+
+        assert len(calls) == 1
+        assert no_sleep == []
+
+    async def test_retry_exception_subclass_only(self, no_sleep):
+        """Tylko wskazany typ (i jego podklasy) jest ponawiany"""
+
+        class OtherConflict(Exception):
+            pass
+
+        calls = []
+
+        async def operation():
+            calls.append(1)
+            raise OtherConflict()
+
+        with pytest.raises(OtherConflict):
+            await retry_with_backoff(operation, 3, retry_on=ConflictError)
+
+        assert len(calls) == 1
+
+    async def test_backoff_adapts_to_aborts_and_commits(self, no_sleep):
+        """Abort wydłuża, a commit skraca wyuczony backoff"""
+
+        async def conflict():
+            raise ConflictError()
+
+        async def ok():
+            return "ok"
+
+        with pytest.raises(ConflictError):
+            await retry_with_backoff(conflict, 1, retry_on=ConflictError, name="hot")
+        assert _retry._BACKOFF_TABLE[("hot", 0)] == pytest.approx(_retry.INITIAL_MS * 1.2)
+
+        await retry_with_backoff(ok, 1, retry_on=ConflictError, name="cold")
+        assert _retry._BACKOFF_TABLE[("cold", 0)] == pytest.approx(_retry.INITIAL_MS / 1.1)
+
+    def test_backoff_delay_is_capped(self, no_sleep):
+        for _ in range(100):
+            _retry._record("hot", 5, committed=False)
+
+        assert _retry._BACKOFF_TABLE[("hot", 2)] == _retry.MAX_MS
+        for attempt in range(20):
+            assert 0 <= backoff_delay("hot", attempt) < _retry.MAX_MS / 1000